@@ -10,7 +10,6 @@ from __future__ import annotations
 import os
 from typing import Any
 
-import ayon_api
 from ayon_core.addon import AYONAddon, IPluginPaths, ITrayService
 from ayon_core.lib import Logger
 
@@ -19,6 +18,7 @@ from .version import __version__
 log = Logger.get_logger(__name__)
 
 AIRTABLE_ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+_PUBLISH_PLUGIN_PATH = os.path.join(AIRTABLE_ADDON_DIR, "plugins", "publish")
 
 
 class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
@@ -46,6 +46,8 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
             self.settings
         )
         self.webserver = None
+        self._tray_ui = None
+        self._api_secret_cache: dict[str, str] = {}
 
     def add_implementation_envs(
             self, env: dict[str, Any], app: object) -> None:
@@ -60,7 +62,6 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
         attribs_map = self.get_attrib_maps_settings()
         defaults = {
             "AYON_LOG_NO_COLORS": "1",
-            "AIRTABLE_API_KEY": self.get_api_secret(),
             "AIRTABLE_BASE_NAME": server_settings.get(
                 "base_name", ""),
             "AIRTABLE_TABLE_NAME": server_settings.get(
@@ -72,17 +73,24 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
             "AIRTABLE_VERSION_FIELD": attribs_map.get(
                 "version", ""),
         }
-        for key, value in defaults.items():
-            if not env.get(key):
-                env[key] = value
+        env.update({
+            key: value
+            for key, value in defaults.items()
+            if not env.get(key)
+        })
+        # Resolving the secret needs a server request, only do it when
+        # the key is not provided yet.
+        if not env.get("AIRTABLE_API_KEY"):
+            env["AIRTABLE_API_KEY"] = self.get_api_secret()
 
         # Remove auto screen scale factor for Qt
         env.pop("QT_AUTO_SCREEN_SCALE_FACTOR", None)
 
     def tray_init(self) -> None:
-        """Called when the tray is initializing."""
-        from ayon_airtable.tray.dialog import AirtableTrayDialog
-        self.tray_ui = AirtableTrayDialog(self)
+        """Called when the tray is initializing.
+
+        The tray dialog is created lazily on the first `tray_menu` call.
+        """
 
     def tray_exit(self) -> None:
         """Called when the tray is exiting."""
@@ -102,8 +110,12 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
             tray_menu (dict[str, Any]): Tray menu.
 
         """
-        if self.enabled:
-            self.tray_ui.tray_menu(tray_menu)
+        if not self.enabled:
+            return
+        if self._tray_ui is None:
+            from ayon_airtable.tray.dialog import AirtableTrayDialog
+            self._tray_ui = AirtableTrayDialog(self)
+        self._tray_ui.tray_menu(tray_menu)
 
     def get_plugin_paths(self) -> dict[str, Any]:  # noqa: PLR6301
         """Get the plugin paths for the Airtable addon.
@@ -111,11 +123,7 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
         Returns:
             dict: A dictionary containing the plugin paths.
         """
-        return {
-            "publish": [
-                os.path.join(AIRTABLE_ADDON_DIR, "plugins", "publish")
-            ]
-        }
+        return {"publish": [_PUBLISH_PLUGIN_PATH]}
 
     def get_attrib_maps_settings(self) -> dict[str, Any]:
         """Get the attribute maps settings for the Airtable addon.
@@ -136,9 +144,17 @@ class AirtableAddon(AYONAddon, ITrayService, IPluginPaths):
     def get_api_secret(self) -> str:
         """Get the Airtable API secret.
 
+        The secret is resolved once per script key and cached.
+
         Returns:
             str: The Airtable API secret.
         """
         service_settings = self.get_service_settings()
-        return ayon_api.get_secret(
-            service_settings["script_key"]).get("value", "")
+        script_key = service_settings["script_key"]
+        api_secret = self._api_secret_cache.get(script_key)
+        if api_secret is None:
+            import ayon_api
+
+            api_secret = ayon_api.get_secret(script_key).get("value", "")
+            self._api_secret_cache[script_key] = api_secret
+        return api_secret
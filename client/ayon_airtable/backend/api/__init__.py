@@ -6,10 +6,60 @@ Objects, methods and functions in this module handle connection
 and errors automatically, managing the verbose approach required
 in PyAirtable.
 """
+from __future__ import annotations
+
+import functools
+import itertools
+import re
 import socket
-from typing import Dict, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pyairtable
+
+# Largest page Airtable serves for list records requests.
+RECORDS_PAGE_SIZE = 100
+
+# Rate limit and transient server errors retried by the session.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Seconds for which the cached records of a project stay valid.
+RECORDS_CACHE_TTL = 60
+
+# Product names matched by a single OR formula, kept under the page size.
+FORMULA_CHUNK_SIZE = 95
+
+_VERSION_RE = re.compile(r"(\d+)")
+
+
+def _version_key(value: object) -> int:
+    """Get a numeric sort key of a version value.
 
-import pyairtable
+    Versions may be stored as numbers or as text like "v010", text is
+    compared by its first number so "v10" sorts after "v9".
+
+    Args:
+        value (object): The version field value.
+
+    Returns:
+        int: The version number, -1 if there is none.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _VERSION_RE.search(str(value or ""))
+    return int(match.group(1)) if match else -1
+
+
+@functools.lru_cache(maxsize=1)
+def _get_host_name() -> str:
+    """Get the host name of the current machine once per process.
+
+    Returns:
+        str: The host name of the current machine.
+    """
+    return socket.gethostname()
 
 
 class AirtablePythonWrapper:
@@ -23,9 +73,18 @@ class AirtablePythonWrapper:
         self
     ) -> None:
         """Initialize the Airtable Python Wrapper."""
-        self._host_name = None
-        self._api = None
-        self._table = None
+        self._apis: Dict[str, pyairtable.Api] = {}
+        self._tables: Dict[Tuple[str, str, str], pyairtable.Table] = {}
+        # Guards lazily resolved handles and caches, the wrapper is
+        # shared between REST endpoints running in worker threads.
+        self._lock = threading.RLock()
+        self._base_ids_by_name: Dict[str, Dict[str, str]] = {}
+        # Records caches keyed by (base id, table name, project field,
+        # product field, project name).
+        self._records_cache: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self._products_by_project: Dict[Tuple[str, ...], List[str]] = {}
+        self._cache_expiry: Dict[Tuple[str, ...], float] = {}
+        self._formula_cache: Dict[Tuple[str, str], str] = {}
 
     @property
     def host_name(self) -> str:
@@ -34,9 +93,7 @@ class AirtablePythonWrapper:
         Returns:
             str: The host name of the current machine.
         """
-        if not self._host_name:
-            self._host_name = socket.gethostname()
-        return self._host_name
+        return _get_host_name()
 
     def api(self, api_key: str) -> pyairtable.Api:
         """Get the PyAirtable API instance, initializing it if necessary.
@@ -47,9 +104,27 @@ class AirtablePythonWrapper:
         Returns:
             pyairtable.Api: The initialized PyAirtable API instance.
         """
-        if self._api is None:
-            self._api = pyairtable.Api(api_key)
-        return self._api
+        with self._lock:
+            api = self._apis.get(api_key)
+            if api is None:
+                import pyairtable
+                from requests.adapters import HTTPAdapter
+
+                retry = pyairtable.retry_strategy(
+                    total=3,
+                    backoff_factor=0.2,
+                    status_forcelist=RETRY_STATUS_CODES,
+                )
+                # The adapter below carries the retries, pyairtable must
+                # not mount its own
+                api = pyairtable.Api(api_key, retry_strategy=False)
+                # Keep a larger keep-alive pool for bursty publishes
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=16, max_retries=retry
+                )
+                api.session.mount("https://", adapter)
+                self._apis[api_key] = api
+        return api
 
     def _get_bases_data_by_api_key(
             self, api_key: Optional[str] = None) -> Dict:
@@ -62,10 +137,18 @@ class AirtablePythonWrapper:
         Returns:
             Dict: The data of Airtable bases retrieved using the API key.
         """
-        if self._api is None:
-            self._api = self.api(api_key)
-        base_urls = self._api.urls.bases
-        return self._api.get(base_urls)
+        api = self.api(api_key)
+        base_urls = api.urls.bases
+        bases = api.get(base_urls)
+        base_ids_by_name = {
+            base["name"]: base["id"]
+            for base_set in bases.values()
+            if isinstance(base_set, list)
+            for base in base_set
+        }
+        with self._lock:
+            self._base_ids_by_name[api_key] = base_ids_by_name
+        return bases
 
     def _get_base_id_by_name(
             self, api_key: str, base_name: str) -> str:
@@ -78,12 +161,27 @@ class AirtablePythonWrapper:
         Returns:
             str: The ID of the Airtable base.
         """
-        bases = self._get_bases_data_by_api_key(api_key)
-        for base_set in bases.values():
-            for base in base_set:
-                if base_name in base["name"]:
-                    return base["id"]
-        return ""
+        with self._lock:
+            base_ids_by_name = self._base_ids_by_name.get(api_key)
+        if base_ids_by_name is None:
+            # Fetched without the lock, concurrent lookups of other keys
+            # must not wait for this request
+            self._get_bases_data_by_api_key(api_key)
+            with self._lock:
+                base_ids_by_name = self._base_ids_by_name[api_key]
+
+        base_id = base_ids_by_name.get(base_name)
+        if base_id:
+            return base_id
+        # Fall back to the previous substring match for backwards
+        # compatibility with partial base names in settings.
+        return next(
+            (
+                base_id for name, base_id in base_ids_by_name.items()
+                if base_name in name
+            ),
+            ""
+        )
 
     def get_base(
             self, api_key: str, base_name: str) -> pyairtable.Base:
@@ -104,22 +202,32 @@ class AirtablePythonWrapper:
             msg = f"Base '{base_name}' not found."
             raise RuntimeError(msg)
 
-        return self._api.base(base_id)
+        return self.api(api_key).base(base_id)
 
     def get_table(
             self, api_key: str,
             base_name: str, table_name: str) -> pyairtable.Table:
         """Get the Airtable table by name.
 
+        Resolved tables are cached per API key, base and table name.
+
         Returns:
             pyairtable.Table: The Airtable table instance.
 
         Raises:
             RuntimeError: If the specified table name is not found.
         """
+        key = (api_key, base_name, table_name)
+        with self._lock:
+            table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        # Resolved without the lock, a concurrent lookup of the same key
+        # may resolve it too and the first stored table wins
         base = self.get_base(api_key, base_name)
         try:
-            self._table = base.table(table_name)
+            table = base.table(table_name)
 
         except Exception as e:
             msg = (
@@ -127,7 +235,8 @@ class AirtablePythonWrapper:
                 f"'{base_name}'."
             )
             raise RuntimeError(msg) from e
-        return self._table
+        with self._lock:
+            return self._tables.setdefault(key, table)
 
     def update_record(
         self,
@@ -149,9 +258,127 @@ class AirtablePythonWrapper:
         Returns:
             Dict: The updated record data.
         """
-        if self._table is None:
-            self._table = self.get_table(api_key, base_name, table_name)
-        return self._table.update(record_id, fields)
+        table = self.get_table(api_key, base_name, table_name)
+        self.invalidate_cache()
+        return table.update(record_id, fields)
+
+    def batch_update_records(
+        self,
+        api_key: str,
+        base_name: str,
+        table_name: str,
+        records: List[Dict],
+    ) -> List[Dict]:
+        """Update several records in the Airtable table.
+
+        Airtable accepts up to 10 records per request, pyairtable splits
+        the records into such chunks.
+
+        Args:
+            api_key (str): The Airtable API key to use.
+            base_name (str): The name of the Airtable base.
+            table_name (str): The name of the Airtable table.
+            records (List[Dict]): Records to update, each with `id` and
+                `fields` keys.
+
+        Returns:
+            List[Dict]: The updated records data.
+        """
+        table = self.get_table(api_key, base_name, table_name)
+        self.invalidate_cache()
+        return table.batch_update(records)
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached records so the next lookup refetches them."""
+        with self._lock:
+            self._cache_expiry.clear()
+
+    def _refresh_cache(
+        self,
+        table: pyairtable.Table,
+        project_field: str,
+        project_name: str,
+        product_field: str,
+        *,
+        refresh: bool = False,
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """Refresh the cached records of a project if they have expired.
+
+        The project filter is pushed to Airtable with a formula and only
+        the product field is requested, so just the matching rows of
+        the project travel over the wire. Records are streamed page by
+        page with `Table.iterate` and both lookup indexes are filled in
+        a single pass.
+
+        Args:
+            table (pyairtable.Table): The Airtable table to read.
+            project_field (str): The field name for the project.
+            project_name (str): The name of the project to cache.
+            product_field (str): The field name for the product.
+            refresh (bool): Re-read the records even if the cache is
+                still valid.
+
+        Returns:
+            Tuple[Dict[str, str], List[str]]: The record IDs by product
+                name and the product names of the project.
+        """
+        key = (
+            table.base.id, table.name,
+            project_field, product_field, project_name
+        )
+        with self._lock:
+            expiry = self._cache_expiry.get(key, 0.0)
+            if not refresh and time.monotonic() <= expiry:
+                return (
+                    self._records_cache[key],
+                    self._products_by_project[key],
+                )
+            formula = self._get_project_formula(project_field, project_name)
+
+        # Records are streamed without the lock, lookups of other projects
+        # must not wait for this one
+        record_ids: Dict[str, str] = {}
+        records = table.iterate(
+            page_size=RECORDS_PAGE_SIZE,
+            formula=formula,
+            fields=[product_field],
+        )
+        for page in records:
+            for record in page:
+                product_name = record.get("fields", {}).get(product_field)
+                if not product_name:
+                    continue
+                record_ids.setdefault(product_name, record["id"])
+
+        # Keys are unique and keep the first-seen order of products
+        product_names = list(record_ids)
+        with self._lock:
+            self._records_cache[key] = record_ids
+            self._products_by_project[key] = product_names
+            self._cache_expiry[key] = time.monotonic() + RECORDS_CACHE_TTL
+        return record_ids, product_names
+
+    def _get_project_formula(
+            self, project_field: str, project_name: str) -> str:
+        """Get the formula matching records of a project.
+
+        The formula string is built once per field and project name.
+
+        Args:
+            project_field (str): The field name for the project.
+            project_name (str): The name of the project to match.
+
+        Returns:
+            str: The Airtable formula.
+        """
+        key = (project_field, project_name)
+        formula = self._formula_cache.get(key)
+        if formula is None:
+            from pyairtable.formulas import match, to_formula_str
+
+            formula = to_formula_str(match({project_field: project_name}))
+            self._formula_cache[key] = formula
+        return formula
 
     def get_record_id(
         self,
@@ -171,26 +398,103 @@ class AirtablePythonWrapper:
                 in the table.
                 - product_name_field: The field name for the product
                 in the table.
+                - version_field: Optional, the field name for the
+                version. When set, the record with the highest version
+                is returned.
 
         Returns:
             Optional[str]: The record ID if found, otherwise None.
         """
-        if self._table is None:
-            self._table = self.get_table(
-                kwargs["api_key"], kwargs["base_name"], kwargs["table_name"]
+        table = self.get_table(
+            kwargs["api_key"], kwargs["base_name"], kwargs["table_name"]
+        )
+        product_name = kwargs["product_name"]
+        if kwargs.get("version_field"):
+            record_ids = self.get_record_ids(
+                **kwargs, product_names=[product_name])
+            return record_ids.get(product_name)
+
+        record_ids, _ = self._refresh_cache(
+            table,
+            kwargs["project_name_field"],
+            kwargs["project_name"],
+            kwargs["product_name_field"],
+        )
+        return record_ids.get(product_name)
+
+    def get_record_ids(
+        self,
+        **kwargs: Dict[str, str],
+    ) -> Dict[str, str]:
+        """Get the record IDs for several products at once.
+
+        With a version field the products are matched with one OR
+        formula per chunk of names and the highest version record of
+        each product wins. Versions are compared numerically as text
+        versions would sort wrong on the server. Otherwise the cached
+        project records are used.
+
+        Args:
+            kwargs (Dict[str, str]): A dictionary containing the
+            following keys:
+                - api_key: The Airtable API key to use.
+                - base_name: The name of the Airtable base.
+                - table_name: The name of the Airtable table.
+                - project_name: The name of the project to match.
+                - product_names: The names of the products to match.
+                - project_name_field: The field name for the project
+                in the table.
+                - product_name_field: The field name for the product
+                in the table.
+                - version_field: Optional, the field name for the
+                version.
+
+        Returns:
+            Dict[str, str]: The record IDs by product name, products
+                without a record are left out.
+        """
+        table = self.get_table(
+            kwargs["api_key"], kwargs["base_name"], kwargs["table_name"]
+        )
+        product_names = list(dict.fromkeys(kwargs["product_names"]))
+        project_field = kwargs["project_name_field"]
+        product_field = kwargs["product_name_field"]
+        version_field = kwargs.get("version_field")
+        if not version_field:
+            record_ids, _ = self._refresh_cache(
+                table, project_field, kwargs["project_name"], product_field
             )
-        for record in self._table.all():
-            field = record.get("fields", {})
-            if not field:
-                continue
-
-            if (
-                field.get(kwargs["product_name_field"]) == kwargs["product_name"]  # noqa: E501
-                and
-                field.get(kwargs["project_name_field"]) == kwargs["project_name"]  # noqa: E501
-            ):
-                return record["id"]
-        return None
+            return {
+                name: record_ids[name]
+                for name in product_names
+                if name in record_ids
+            }
+
+        from pyairtable.formulas import AND, EQ, OR, Field, match
+
+        project_formula = match({project_field: kwargs["project_name"]})
+        best: Dict[str, Tuple[int, str]] = {}
+        for idx in range(0, len(product_names), FORMULA_CHUNK_SIZE):
+            chunk = product_names[idx:idx + FORMULA_CHUNK_SIZE]
+            # Stream the pages, only the best record per product is kept
+            pages = table.iterate(
+                page_size=RECORDS_PAGE_SIZE,
+                formula=AND(
+                    project_formula,
+                    OR(*(EQ(Field(product_field), name) for name in chunk)),
+                ),
+                fields=[product_field, version_field],
+            )
+            for record in itertools.chain.from_iterable(pages):
+                fields = record["fields"]
+                name = fields.get(product_field)
+                if not name:
+                    continue
+                version = _version_key(fields.get(version_field))
+                current = best.get(name)
+                if current is None or version > current[0]:
+                    best[name] = (version, record["id"])
+        return {name: record_id for name, (_, record_id) in best.items()}
 
     def get_product_name_field(
         self,
@@ -209,24 +513,21 @@ class AirtablePythonWrapper:
                 in the table.
                 - product_name_field: The field name for the product
                 in the table.
+                - refresh: Optional, re-read the records even if the
+                cached product names are still valid.
 
         Returns:
             Optional[list]: The list of product name field if found,
                 otherwise None.
         """
-        product_names = []
-        if self._table is None:
-            self._table = self.get_table(
-                kwargs["api_key"], kwargs["base_name"], kwargs["table_name"]
-            )
-        for record in self._table.all():
-            fields = record.get("fields", {})
-            product_name_field = kwargs["product_name_field"]
-            project_name_field = kwargs["project_name_field"]
-            if (
-                fields.get(product_name_field)
-                and fields.get(project_name_field) == kwargs["project_name"]
-            ):
-                product_names.append(fields[product_name_field])
-
-        return product_names
+        table = self.get_table(
+            kwargs["api_key"], kwargs["base_name"], kwargs["table_name"]
+        )
+        _, product_names = self._refresh_cache(
+            table,
+            kwargs["project_name_field"],
+            kwargs["project_name"],
+            kwargs["product_name_field"],
+            refresh=bool(kwargs.get("refresh")),
+        )
+        return list(product_names)
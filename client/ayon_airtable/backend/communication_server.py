@@ -9,7 +9,10 @@ from typing import TYPE_CHECKING, Union
 
 from aiohttp import web
 
-from ayon_airtable.backend.rest_api import AirtableModuleRestAPI
+from ayon_airtable.backend.rest_api import (
+    AirtableModuleRestAPI,
+    compress_response,
+)
 
 if TYPE_CHECKING:
     from asyncio import AbstractEventLoop
@@ -29,7 +32,8 @@ class WebServer:
         self.client = None
 
         self.loop: AbstractEventLoop = asyncio.new_event_loop()
-        self.app = web.Application(loop=self.loop)
+        self.app = web.Application(
+            loop=self.loop, middlewares=[compress_response])
         self.port = 607011
         self.websocket_thread = WebServerThread(self,
             self.port, loop=self.loop
@@ -3,12 +3,37 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from aiohttp import web
 from ayon_core.lib import Logger
 
 from ayon_airtable.backend import rest_routes
 
 if TYPE_CHECKING:
-    from aiohttp.web import UrlDispatcher
+    from aiohttp.typedefs import Handler
+    from aiohttp.web import Request, StreamResponse, UrlDispatcher
+
+# Responses smaller than this are not worth compressing.
+COMPRESSION_MIN_SIZE = 1024
+
+
+@web.middleware
+async def compress_response(
+        request: Request, handler: Handler) -> StreamResponse:
+    """Gzip larger responses when the client accepts it.
+
+    Returns:
+        StreamResponse: Response of the handler.
+
+    """
+    response = await handler(request)
+    body = getattr(response, "body", None)
+    if (
+        isinstance(body, bytes)
+        and len(body) > COMPRESSION_MIN_SIZE
+        and "gzip" in request.headers.get("Accept-Encoding", "")
+    ):
+        response.enable_compression(web.ContentCoding.gzip)
+    return response
 
 
 class AirtableModuleRestAPI:
@@ -41,10 +66,19 @@ class AirtableModuleRestAPI:
         self.server_manager.add_route(
             "POST", f"{self.prefix}/get_record_id", get_record_id.dispatch
         )
+        get_record_ids = rest_routes.GetRecordIdsEndpoint()
+        self.server_manager.add_route(
+            "POST", f"{self.prefix}/get_record_ids", get_record_ids.dispatch
+        )
         update_record = rest_routes.UpdateRecordEndpoint()
         self.server_manager.add_route(
             "POST", f"{self.prefix}/update_record", update_record.dispatch
         )
+        batch_update_records = rest_routes.BatchUpdateRecordsEndpoint()
+        self.server_manager.add_route(
+            "POST", f"{self.prefix}/batch_update_records",
+            batch_update_records.dispatch
+        )
         get_product_name_field = rest_routes.GetProductNameFieldEndpoint()
         self.server_manager.add_route(
             "POST", f"{self.prefix}/get_product_name_field",
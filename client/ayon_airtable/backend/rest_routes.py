@@ -1,6 +1,7 @@
 """Rest routes for Airtable backend."""
 from __future__ import annotations
 
+import asyncio
 import datetime
 import json
 from typing import Any, Union
@@ -13,13 +14,18 @@ from ayon_airtable.backend import api
 
 log = Logger.get_logger("P4routes")
 
+# One wrapper shared by all endpoints so the pyairtable session, resolved
+# handles and records cache are reused between requests. Blocking
+# Airtable calls run in worker threads so the event loop stays free.
+_SHARED_WRAPPER = api.AirtablePythonWrapper()
+
 
 class AirtableRestApiEndpoint(RestApiEndpoint):
     """Base class for Airtable Rest API endpoints."""
     def __init__(self):
         """Init."""
         super().__init__()
-        self._wrapper = api.AirtablePythonWrapper()
+        self._wrapper = _SHARED_WRAPPER
 
     @staticmethod
     def json_dump_handler(value: Any) -> Union[list, str]:  # noqa: ANN401
@@ -48,7 +54,7 @@ class AirtableRestApiEndpoint(RestApiEndpoint):
         """
         return json.dumps(
             data,
-            indent=4,
+            separators=(",", ":"),
             default=cls.json_dump_handler
         ).encode("utf-8")
 
@@ -72,10 +78,12 @@ class AirtableApiEndpoint(AirtableRestApiEndpoint):
                 content_type="text/plain"
             )
 
-        result = self._wrapper.api(api_key)
+        # The pyairtable Api object is not JSON serializable, only report
+        # that the client is ready.
+        self._wrapper.api(api_key)
         return Response(
             status=200,
-            body=self.encode(result),
+            body=self.encode({"ok": True}),
             content_type="application/json"
         )
 
@@ -92,11 +100,17 @@ class GetTableEndpoint(AirtableRestApiEndpoint):
         """
         content = await request.json()
 
-        result = self._wrapper.get_table(
+        table = await asyncio.to_thread(
+            self._wrapper.get_table,
             content["api_key"],
             content["base_name"],
             content["table_name"]
         )
+        # Return a lightweight descriptor instead of the Table object.
+        result = {
+            "base_name": content["base_name"],
+            "table_name": table.name,
+        }
         return Response(
             status=200,
             body=self.encode(result),
@@ -122,9 +136,11 @@ class GetRecordIdEndpoint(AirtableRestApiEndpoint):
             "project_name": content["project_name"],
             "product_name": content["product_name"],
             "project_name_field": content["project_name_field"],
-            "product_name_field": content["product_name_field"]
+            "product_name_field": content["product_name_field"],
+            "version_field": content.get("version_field"),
         }
-        result = self._wrapper.get_record_id(**kwargs)
+        result = await asyncio.to_thread(
+            self._wrapper.get_record_id, **kwargs)
 
         return Response(
             status=200,
@@ -133,6 +149,35 @@ class GetRecordIdEndpoint(AirtableRestApiEndpoint):
         )
 
 
+class GetRecordIdsEndpoint(AirtableRestApiEndpoint):
+    """Return record IDs of several products from Airtable."""
+
+    async def post(self, request: Request) -> Response:
+        """Get Record IDs from Airtable Endpoint.
+
+        Returns:
+            Response: Response object.
+
+        """
+        content = await request.json()
+        result = await asyncio.to_thread(
+            self._wrapper.get_record_ids,
+            api_key=content["api_key"],
+            base_name=content["base_name"],
+            table_name=content["table_name"],
+            project_name=content["project_name"],
+            product_names=content["product_names"],
+            project_name_field=content["project_name_field"],
+            product_name_field=content["product_name_field"],
+            version_field=content.get("version_field"),
+        )
+        return Response(
+            status=200,
+            body=self.encode(result),
+            content_type="application/json"
+        )
+
+
 class UpdateRecordEndpoint(AirtableRestApiEndpoint):
     """Return update record from Airtable."""
 
@@ -145,7 +190,8 @@ class UpdateRecordEndpoint(AirtableRestApiEndpoint):
         """
         content = await request.json()
 
-        result = self._wrapper.update_record(
+        result = await asyncio.to_thread(
+            self._wrapper.update_record,
             api_key=content["api_key"],
             base_name=content["base_name"],
             table_name=content["table_name"],
@@ -159,6 +205,32 @@ class UpdateRecordEndpoint(AirtableRestApiEndpoint):
         )
 
 
+class BatchUpdateRecordsEndpoint(AirtableRestApiEndpoint):
+    """Update several records in Airtable."""
+
+    async def post(self, request: Request) -> Response:
+        """Batch Update Records from Airtable Endpoint.
+
+        Returns:
+            Response: Response object.
+
+        """
+        content = await request.json()
+
+        result = await asyncio.to_thread(
+            self._wrapper.batch_update_records,
+            api_key=content["api_key"],
+            base_name=content["base_name"],
+            table_name=content["table_name"],
+            records=content["records"]
+        )
+        return Response(
+            status=200,
+            body=self.encode(result),
+            content_type="application/json"
+        )
+
+
 class GetProductNameFieldEndpoint(AirtableRestApiEndpoint):
     """Return product name field from Airtable."""
 
@@ -170,13 +242,15 @@ class GetProductNameFieldEndpoint(AirtableRestApiEndpoint):
 
         """
         content = await request.json()
-        result = self._wrapper.get_product_name_field(
+        result = await asyncio.to_thread(
+            self._wrapper.get_product_name_field,
             api_key=content["api_key"],
             base_name=content["base_name"],
             table_name=content["table_name"],
             project_name=content["project_name"],
             product_name_field=content["product_name_field"],
-            project_name_field=content["project_name_field"]
+            project_name_field=content["project_name_field"],
+            refresh=content.get("refresh", False),
         )
         return Response(
             status=200,
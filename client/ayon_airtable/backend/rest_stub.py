@@ -2,14 +2,41 @@
 
 from __future__ import annotations
 
+import json
 import os
+import time
 from logging import getLogger
-from typing import Union
+from typing import Any, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 log = getLogger(__name__)
 
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_WEBSERVER_URL = None
+
+# Seconds for which read results are reused by the stub, publisher UI
+# refreshes of attribute definitions within this window are free.
+READ_CACHE_TTL = 60
+_READ_CACHE: dict[str, tuple[float, Any]] = {}
+
+
+def _get_webserver_url() -> str:
+    """Get the Airtable webserver URL, caching it once it is known.
+
+    Returns:
+        str: The Airtable webserver URL or empty string if not set.
+
+    """
+    global _WEBSERVER_URL  # noqa: PLW0603
+    if not _WEBSERVER_URL:
+        _WEBSERVER_URL = os.environ.get("AIRTABLE_WEBSERVER_URL")
+    return _WEBSERVER_URL or ""
+
 
 class AirtableRestStub:
     """Airtable REST API stub."""
@@ -29,19 +56,52 @@ class AirtableRestStub:
             RuntimeError: If the server response is not OK.
 
         """
-        webserver_url = os.environ.get("AIRTABLE_WEBSERVER_URL")
+        webserver_url = _get_webserver_url()
         if not webserver_url:
             msg = "Unknown url for Airtable"
             raise RuntimeError(msg)
 
         action_url = f"{webserver_url}/airtable/{command}"
 
-        response = requests.post(action_url, json=kwargs, timeout=10)
+        response = _SESSION.post(action_url, json=kwargs, timeout=10)
         if not response.ok:
             log.debug(response.content)
             raise RuntimeError(response.text)
         return response.json()
 
+    @staticmethod
+    def _cached_call(command: str, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Call a read command, reusing recent results of the same call.
+
+        Publish plugins and attribute definitions ask for the same
+        Airtable data several times, the result is kept for
+        `READ_CACHE_TTL` seconds. Passing `refresh=True` skips the
+        cached result.
+
+        Args:
+            command (str): Command to call.
+            kwargs: Arguments for the command.
+
+        Returns:
+            Any: Response from the server.
+
+        """
+        key_data = {k: v for k, v in kwargs.items() if k != "refresh"}
+        key = f"{command}:{json.dumps(key_data, sort_keys=True)}"
+        now = time.monotonic()
+        cached = _READ_CACHE.get(key)
+        if cached and not kwargs.get("refresh") and cached[0] > now:
+            return cached[1]
+
+        result = AirtableRestStub._wrap_call(command, **kwargs)
+        _READ_CACHE[key] = (now + READ_CACHE_TTL, result)
+        return result
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the cached read results."""
+        _READ_CACHE.clear()
+
     @staticmethod
     def api(api_key: str) -> dict:
         """Check if the API key is in any workspace.
@@ -56,19 +116,23 @@ class AirtableRestStub:
         return AirtableRestStub._wrap_call("api", api_key=api_key)
 
     @staticmethod
-    def get_table(api_key: str, base_name: str) -> dict:
-        """Get tables from the Airtable base.
+    def get_table(api_key: str, base_name: str, table_name: str) -> dict:
+        """Get a table from the Airtable base.
 
         Args:
             api_key (str): The Airtable API key to use.
             base_name (str): The name of the Airtable base.
+            table_name (str): The name of the Airtable table.
 
         Returns:
-            dict: Response from the server.
+            dict: Response from the server with the base and table name.
 
         """
-        return AirtableRestStub._wrap_call(
-            "get_table", api_key=api_key, base_name=base_name
+        return AirtableRestStub._cached_call(
+            "get_table",
+            api_key=api_key,
+            base_name=base_name,
+            table_name=table_name
         )
 
     @staticmethod
@@ -89,6 +153,7 @@ class AirtableRestStub:
             dict: Response from the server.
 
         """
+        AirtableRestStub.clear_cache()
         return AirtableRestStub._wrap_call(
             "update_record",
             api_key=api_key,
@@ -98,6 +163,32 @@ class AirtableRestStub:
             fields=fields
         )
 
+    @staticmethod
+    def batch_update_records(
+        api_key: str, base_name: str, table_name: str, records: list
+    ) -> list:
+        """Update several records in the Airtable table in one call.
+
+        Args:
+            api_key (str): The Airtable API key to use.
+            base_name (str): The name of the Airtable base.
+            table_name (str): The name of the Airtable table.
+            records (list): Records to update, each with `id` and
+                `fields` keys.
+
+        Returns:
+            list: Response from the server.
+
+        """
+        AirtableRestStub.clear_cache()
+        return AirtableRestStub._wrap_call(
+            "batch_update_records",
+            api_key=api_key,
+            base_name=base_name,
+            table_name=table_name,
+            records=records
+        )
+
     @staticmethod
     def get_record_id(**kwargs: str) -> dict:
         """Get the record ID for the given data.
@@ -113,12 +204,39 @@ class AirtableRestStub:
                     in Airtable.
                 product_name_field (str): The field name for the product
                     in Airtable.
+                version_field (str, optional): The field name for the
+                    version, the latest version record is returned.
 
         Returns:
             Union[str, None]: The record ID if found, otherwise None.
 
         """
-        return AirtableRestStub._wrap_call("get_record_id", **kwargs)
+        return AirtableRestStub._cached_call("get_record_id", **kwargs)
+
+    @staticmethod
+    def get_record_ids(**kwargs: str) -> dict:
+        """Get the record IDs of several products in one call.
+
+        Args:
+            **kwargs: Arbitrary keyword arguments containing:
+                api_key (str): The Airtable API key to use.
+                base_name (str): The name of the Airtable base.
+                table_name (str): The name of the Airtable table.
+                project_name (str): The name of the project to match.
+                product_names (list[str]): The names of the products
+                    to match.
+                project_name_field (str): The field name for the project
+                    in Airtable.
+                product_name_field (str): The field name for the product
+                    in Airtable.
+                version_field (str, optional): The field name for the
+                    version, the latest version record is returned.
+
+        Returns:
+            dict: Record IDs by product name.
+
+        """
+        return AirtableRestStub._cached_call("get_record_ids", **kwargs)
 
     @staticmethod
     def get_product_name_field(**kwargs: str) -> dict:
@@ -134,9 +252,12 @@ class AirtableRestStub:
                     in Airtable.
                 product_name_field (str): The field name for the product
                     in Airtable.
+                refresh (bool, optional): Bypass the cached product
+                    names and read them from Airtable.
 
         Returns:
             dict: Response from the server.
 
         """
-        return AirtableRestStub._wrap_call("get_product_name_field", **kwargs)
+        return AirtableRestStub._cached_call(
+            "get_product_name_field", **kwargs)
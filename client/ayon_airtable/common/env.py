@@ -0,0 +1,37 @@
+"""Airtable settings exposed to hosts via environment variables."""
+from __future__ import annotations
+
+import functools
+import os
+from typing import NamedTuple, Optional
+
+
+class AirtableEnv(NamedTuple):
+    """Airtable environment variables set by `add_implementation_envs`."""
+
+    api_key: Optional[str]
+    base_name: Optional[str]
+    table_name: Optional[str]
+    project_field: Optional[str]
+    product_name_field: Optional[str]
+    version_field: Optional[str]
+
+
+@functools.lru_cache(maxsize=1)
+def airtable_env() -> AirtableEnv:
+    """Get the Airtable environment variables.
+
+    The variables are set before the host launches, so they are read
+    only once.
+
+    Returns:
+        AirtableEnv: The Airtable environment variables.
+    """
+    return AirtableEnv(
+        api_key=os.getenv("AIRTABLE_API_KEY"),
+        base_name=os.getenv("AIRTABLE_BASE_NAME"),
+        table_name=os.getenv("AIRTABLE_TABLE_NAME"),
+        project_field=os.getenv("AIRTABLE_PROJECT_FIELD"),
+        product_name_field=os.getenv("AIRTABLE_PRODUCT_NAME_FIELD"),
+        version_field=os.getenv("AIRTABLE_VERSION_FIELD"),
+    )
@@ -1,15 +1,15 @@
 
 """Collects Airtable API and stores them in the context data."""
 
-import os
 from typing import ClassVar
 
 import pyblish.api
+from ayon_airtable.common.env import airtable_env
 
 
 class CollectAirtableAPI(pyblish.api.ContextPlugin):
     """Collects Airtable API key and base name from the addon settings."""
-    order = pyblish.api.CollectorOrder + 0.1
+    order = pyblish.api.CollectorOrder - 0.1
     label = "Collect Airtable API"
     families: ClassVar[list[str]] = ["editorial", "editorial_pkg"]
 
@@ -21,12 +21,26 @@ class CollectAirtableAPI(pyblish.api.ContextPlugin):
             store Airtable API, base, and table information.
         """
         self.log.info("Collecting Airtable API and base information.")
-        context.data["airtableApi"] = os.getenv("AIRTABLE_API_KEY")
-        context.data["airtableBase"] = os.getenv("AIRTABLE_BASE_NAME")
-        context.data["airtableTable"] = os.getenv("AIRTABLE_TABLE_NAME")
-        context.data["airtableProductNameField"] = (
-            os.getenv("AIRTABLE_PRODUCT_NAME_FIELD")
-        )
-        context.data["airtableVersionField"] = (
-            os.getenv("AIRTABLE_VERSION_FIELD")
-        )
+        env = airtable_env()
+        missing = [
+            key
+            for key, value in (
+                ("AIRTABLE_API_KEY", env.api_key),
+                ("AIRTABLE_BASE_NAME", env.base_name),
+                ("AIRTABLE_TABLE_NAME", env.table_name),
+            )
+            if not value
+        ]
+        if missing:
+            self.log.debug(
+                "Skipping, missing environment variables: %s",
+                ", ".join(missing)
+            )
+            return
+
+        context.data["airtableApi"] = env.api_key
+        context.data["airtableBase"] = env.base_name
+        context.data["airtableTable"] = env.table_name
+        context.data["airtableProjectNameField"] = env.project_field
+        context.data["airtableProductNameField"] = env.product_name_field
+        context.data["airtableVersionField"] = env.version_field
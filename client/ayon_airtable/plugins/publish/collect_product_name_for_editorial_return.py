@@ -7,11 +7,11 @@ from Airtable records based on the current project and exposes them for
 user selection during the publishing process.
 """
 
-import os
 from typing import ClassVar
 
 import pyblish.api
 from ayon_airtable.backend.rest_stub import AirtableRestStub
+from ayon_airtable.common.env import airtable_env
 from ayon_core.lib import EnumDef
 from ayon_core.pipeline import get_current_project_name
 from ayon_core.pipeline.publish import PublishError
@@ -41,7 +41,26 @@ class CollectProductNameForEditorialReturn(pyblish.api.ContextPlugin):
             msg = "Airtable table is not set in the context data."
             raise PublishError(msg)
         attr_values = self.get_attr_values_from_data(context.data)
-        context.data["productNames"] = attr_values.get("productNames", [])
+        product_names = attr_values.get("productNames", [])
+        context.data["productNames"] = product_names
+
+        # Resolve the latest record of every selected product once, the
+        # integrator only does dictionary lookups
+        index = {}
+        if product_names:
+            index = AirtableRestStub.get_record_ids(
+                api_key=context.data.get("airtableApi"),
+                base_name=context.data.get("airtableBase"),
+                table_name=context.data.get("airtableTable"),
+                project_name=context.data.get("projectName"),
+                product_names=product_names,
+                project_name_field=context.data.get(
+                    "airtableProjectNameField"),
+                product_name_field=context.data.get(
+                    "airtableProductNameField"),
+                version_field=context.data.get("airtableVersionField"),
+            ) or {}
+        context.data["airtableIndex"] = index
 
     @classmethod
     def get_attribute_defs(cls) -> list:
@@ -50,18 +69,21 @@ class CollectProductNameForEditorialReturn(pyblish.api.ContextPlugin):
         Returns:
         list: List of EnumDef objects for product name selection.
         """
+        env = airtable_env()
         airtable_data = {
-            "api_key": os.getenv("AIRTABLE_API_KEY"),
-            "base_name": os.getenv("AIRTABLE_BASE_NAME"),
-            "table_name": os.getenv("AIRTABLE_TABLE_NAME"),
+            "api_key": env.api_key,
+            "base_name": env.base_name,
+            "table_name": env.table_name,
             "project_name": get_current_project_name(),
-            "product_name_field": os.getenv("AIRTABLE_PRODUCT_NAME_FIELD"),
-            "project_name_field": os.getenv("AIRTABLE_PROJECT_NAME_FIELD"),
+            "product_name_field": env.product_name_field,
+            "project_name_field": env.project_field,
         }
 
-        export_texture_set_enum = (
-            AirtableRestStub.get_product_name_field(**airtable_data)
-        ) or []
+        # Served from the stub read cache on repeated UI refreshes, copy
+        # it so the cached list is never shared with the EnumDef
+        export_texture_set_enum = list(
+            AirtableRestStub.get_product_name_field(**airtable_data) or []
+        )
 
         return [
                 EnumDef(
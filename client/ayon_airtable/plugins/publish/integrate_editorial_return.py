@@ -18,25 +18,48 @@ class CollectEditorialReturn(pyblish.api.InstancePlugin):
     def process(self, instance: pyblish.api.Instance) -> None:
         """Collect editorial return information from the instance."""
         useful_data = self.get_data(instance)
-        for product_name in instance.data.get("productNames", []):
-            record_id = AirtableRestStub.get_record_id(
+        product_names = instance.data.get("productNames", [])
+        if not product_names:
+            return
+        record_ids = dict(instance.context.data.get("airtableIndex") or {})
+        # Products the collector did not resolve are looked up here
+        missing = [name for name in product_names if name not in record_ids]
+        if missing:
+            record_ids.update(AirtableRestStub.get_record_ids(
                 api_key=useful_data["api_key"],
                 base_name=useful_data["base_name"],
                 table_name=useful_data["table_name"],
                 project_name=useful_data["project_name"],
-                product_name=product_name,
+                product_names=missing,
                 project_name_field=useful_data["project_name_field"],
-                product_name_field=useful_data["product_name_field"]
+                product_name_field=useful_data["product_name_field"],
+                version_field=useful_data["version_field"]
+            ) or {})
+        not_found = [
+            name for name in product_names if not record_ids.get(name)
+        ]
+        if not_found:
+            self.log.warning(
+                "No Airtable record found for products: %s",
+                ", ".join(not_found),
             )
+        updates = [
+            {
+                "id": record_ids[product_name],
+                "fields": {"Editorial_Return": instance.name},
+            }
+            for product_name in product_names
+            if record_ids.get(product_name)
+        ]
+        if not updates:
+            return
 
-            AirtableRestStub.update_record(
-                api_key=useful_data["api_key"],
-                base_name=useful_data["base_name"],
-                table_name=useful_data["table_name"],
-                record_id=record_id,
-                fields={"Editorial_Return": instance.name},
-                replace=True
-            )
+        AirtableRestStub.batch_update_records(
+            api_key=useful_data["api_key"],
+            base_name=useful_data["base_name"],
+            table_name=useful_data["table_name"],
+            records=updates
+        )
 
     @staticmethod
     def get_data(instance: pyblish.api.Instance) -> dict:
@@ -59,4 +82,7 @@ class CollectEditorialReturn(pyblish.api.InstancePlugin):
             "product_name_field": instance.context.data.get(
                 "airtableProductNameField"
             ),
+            "version_field": instance.context.data.get(
+                "airtableVersionField"
+            ),
         }
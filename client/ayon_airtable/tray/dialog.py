@@ -3,19 +3,63 @@
 This module provides a Qt dialog for validating Airtable API settings and
 integrates with the AYON tray menu to display Airtable connection status.
 """
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, ClassVar
 
 import requests
-from ayon_core.addon import AYONAddon
-from qtpy import QtWidgets
+from ayon_core.lib import Logger
+from qtpy import QtCore, QtWidgets
+
+if TYPE_CHECKING:
+    from ayon_core.addon import AYONAddon
+
+log = Logger.get_logger(__name__)
 
 HTTP_OK = 200
 HTTP_UNAUTHORIZED = 401
+HTTP_FORBIDDEN = 403
 HTTP_NOT_FOUND = 404
 
+# Cheapest authenticated endpoint, lists the bases the token can access.
+AIRTABLE_VALIDATION_URL = "https://api.airtable.com/v0/meta/bases"
+
+# Seconds for which a validation result is reused.
+VALIDATION_TTL = 300
+
+
+class _ValidationSignals(QtCore.QObject):
+    """Signals emitted by the background validation."""
+
+    finished = QtCore.Signal(bool)
+
+
+class _ValidationRunnable(QtCore.QRunnable):
+    """Validate the Airtable API key off the GUI thread."""
+
+    def __init__(self, dialog: AirtableTrayDialog, api_key: str) -> None:
+        super().__init__()
+        self.signals = _ValidationSignals()
+        self._dialog = dialog
+        self._api_key = api_key
+
+    def run(self) -> None:
+        """Run the validation and emit the result."""
+        try:
+            valid = self._dialog.validate_settings(self._api_key)
+        except RuntimeError:
+            log.warning("Airtable API key validation failed.", exc_info=True)
+            valid = False
+        self.signals.finished.emit(valid)
+
 
 class AirtableTrayDialog(QtWidgets.QDialog):
     """Tray UI for AYON Airtable Addon."""
 
+    # Validation results by API key as (expiry time, is valid)
+    _validation_cache: ClassVar[dict[str, tuple[float, bool]]] = {}
+
     def __init__(
         self,
         addon: AYONAddon,
@@ -26,16 +70,33 @@ class AirtableTrayDialog(QtWidgets.QDialog):
         self.addon = addon
 
         self.setWindowTitle("Validate Airtable Tray")
+        self.host_action = QtWidgets.QAction("Airtable API Key: Validating")
+        self.host_action.setDisabled(True)
+
         # add validate function to ensure the settings applied to the airtable
         api_key = self.addon.get_api_secret()
-        # use requests to check if the Airtable API is reachable
-        validate = self.validate_settings(api_key)
-        if validate:
-            self.host_action = QtWidgets.QAction("Airtable API Key: Valid")
+        self._api_key = api_key
+        cached = self._validation_cache.get(api_key)
+        if cached and cached[0] > time.monotonic():
+            self._set_validation_state(cached[1])
+            return
+
+        # Validation does a network request, keep it off the GUI thread
+        runnable = _ValidationRunnable(self, api_key)
+        runnable.signals.finished.connect(self._on_validation_finished)
+        QtCore.QThreadPool.globalInstance().start(runnable)
+
+    def _on_validation_finished(self, valid: bool) -> None:  # noqa: FBT001
+        self._validation_cache[self._api_key] = (
+            time.monotonic() + VALIDATION_TTL, valid
+        )
+        self._set_validation_state(valid)
+
+    def _set_validation_state(self, valid: bool) -> None:  # noqa: FBT001
+        if valid:
+            self.host_action.setText("Airtable API Key: Valid")
         else:
-            self.host_action = QtWidgets.QAction("Airtable API Key: Invalid")
-
-        self.host_action.setDisabled(True)
+            self.host_action.setText("Airtable API Key: Invalid")
 
     def tray_menu(self, tray_menu: QtWidgets.QMenu) -> None:
         """Add Airtable Submenu to AYON tray.
@@ -51,7 +112,7 @@ class AirtableTrayDialog(QtWidgets.QDialog):
         airtable_tray_menu.addSeparator()
         tray_menu.addMenu(airtable_tray_menu)
 
-    def validate_settings(self, api_key: str) -> bool:
+    def validate_settings(self, api_key: str) -> bool:  # noqa: PLR6301
         """Validate the Airtable settings by making a real API call.
 
         Args:
@@ -69,28 +130,41 @@ class AirtableTrayDialog(QtWidgets.QDialog):
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        response = requests.get(
-            "https://api.airtable.com", headers=headers, timeout=10)
         try:
-            if response.status_code == HTTP_OK:
-                self.log.info("Airtable API is reachable.")
-
-            elif response.status_code == HTTP_UNAUTHORIZED:
-                msg = (
-                    "Airtable Authentication Failed. Invalid Airtable API Key "
-                    "(token). Please check your settings."
-                )
-                raise RuntimeError(msg)
-
-            else:
-                msg = (
-                    f"Airtable API returned status code "
-                    f"{response.status_code}: {response.text}"
-                )
-                raise RuntimeError(msg)
-
+            # Only the status code is needed, the body is never read
+            response = requests.get(
+                AIRTABLE_VALIDATION_URL,
+                headers=headers,
+                timeout=5,
+                stream=True,
+            )
+            response.close()
         except requests.RequestException as e:
             msg = f"Could not connect to Airtable API: {e}"
             raise RuntimeError(msg) from e
 
+        if response.status_code == HTTP_OK:
+            log.info("Airtable API is reachable.")
+
+        elif response.status_code == HTTP_FORBIDDEN:
+            # The token is valid but lacks the 'schema.bases:read' scope
+            log.warning(
+                "Airtable API key is valid but cannot list bases."
+            )
+            return True
+
+        elif response.status_code == HTTP_UNAUTHORIZED:
+            msg = (
+                "Airtable Authentication Failed. Invalid Airtable API Key "
+                "(token). Please check your settings."
+            )
+            raise RuntimeError(msg)
+
+        else:
+            msg = (
+                f"Airtable API returned status code "
+                f"{response.status_code}: {response.reason}"
+            )
+            raise RuntimeError(msg)
+
         return response.status_code == HTTP_OK
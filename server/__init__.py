@@ -1,5 +1,8 @@
 """Server package."""
-from typing import Dict, Type
+import asyncio
+import hashlib
+import time
+from typing import Dict, Optional, Tuple, Type
 
 import httpx
 from ayon_server.addons import BaseServerAddon
@@ -13,6 +16,101 @@ AIRTABLE_ID_ATTRIB = "airtableId"
 AIRTABLE_PATH_ATTRIB = "airtablePath"
 AIRTABLE_PUSH_ATTRIB = "airtablePush"
 
+_ENTITY_SCOPE = frozenset({"project", "folder", "task", "version"})
+_PROJECT_SCOPE = frozenset({"project"})
+_EXPECTED_SCOPES = {
+    AIRTABLE_ID_ATTRIB: _ENTITY_SCOPE,
+    AIRTABLE_PATH_ATTRIB: _ENTITY_SCOPE,
+    AIRTABLE_PUSH_ATTRIB: _PROJECT_SCOPE,
+}
+
+# Seconds for which a successful token check result is reused.
+TOKEN_CHECK_TTL = 300
+TOKEN_CHECK_CACHE_SIZE = 16
+
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+class _CircuitBreaker:
+    """Skip Airtable requests for a while after repeated failures.
+
+    Mirrors `CircuitBreaker` of the leecher service, which ships
+    separately. After `fail_max` consecutive failures the breaker opens
+    and requests are skipped until `reset_timeout` seconds have passed,
+    then one request is let through to probe whether Airtable is back.
+    Further requests are skipped for another `reset_timeout` unless the
+    probe succeeds.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60):
+        """Initialize the breaker in closed state."""
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        """Check whether a request may be made.
+
+        Returns:
+            bool: False while the breaker is open, True for the single
+                probe request once `reset_timeout` has passed.
+        """
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        # Restart the timeout, later requests wait for the probe result
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker at the limit."""
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+
+_AIRTABLE_BREAKER = _CircuitBreaker()
+# Token check results by hashed API key as (expiry time, result)
+_TOKEN_CHECK_CACHE: Dict[str, Tuple[float, Dict]] = {}
+# Running token checks by hashed API key, concurrent checks of one key
+# share a single request
+_TOKEN_CHECKS_IN_FLIGHT: Dict[str, "asyncio.Future[Dict]"] = {}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, keeping connections to Airtable alive.
+
+    Returns:
+        httpx.AsyncClient: The shared HTTP client.
+    """
+    global _HTTP_CLIENT  # noqa: PLW0603
+    if _HTTP_CLIENT is None:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20, keepalive_expiry=60
+            ),
+        )
+    return _HTTP_CLIENT
+
+
+async def _close_http_client() -> None:
+    """Close the shared HTTP client and its keep-alive connections."""
+    global _HTTP_CLIENT  # noqa: PLW0603
+    if _HTTP_CLIENT is None:
+        return
+    client = _HTTP_CLIENT
+    _HTTP_CLIENT = None
+    await client.aclose()
+
 
 class AirtableAddon(BaseServerAddon):
     """Add-on class for the server."""
@@ -29,6 +127,10 @@ class AirtableAddon(BaseServerAddon):
         if need_restart:
             self.request_server_restart()
 
+    async def shutdown(self) -> None:  # noqa: PLR6301
+        """Release the connections to Airtable when the add-on unloads."""
+        await _close_http_client()
+
     def initialize(self) -> None:
         """Initialize the Airtable add-on."""
         self.add_endpoint(
@@ -69,7 +171,7 @@ class AirtableAddon(BaseServerAddon):
             msg = "Invalid service settings, secrets are not set."
             raise InvalidSettingsException(msg)
 
-        return self.check_airtable_token(airtable_api_key)
+        return await self.check_airtable_token(airtable_api_key)
 
     @staticmethod
     async def create_airtable_attributes() -> bool:
@@ -78,7 +180,14 @@ class AirtableAddon(BaseServerAddon):
         Returns:
             bool: True if attributes were created or updated, False otherwise.
         """
-        query = "SELECT name, position, scope, data from public.attributes"
+        query = (
+            "SELECT name, position, scope"
+            " FROM public.attributes WHERE name = ANY($1::text[])"
+        )
+        position_query = (
+            "SELECT COALESCE(MAX(position), 0) AS position"
+            " FROM public.attributes"
+        )
         attribute_defs = {
             AIRTABLE_ID_ATTRIB: {
                 "data": {"type": "string", "title": "airtable id",
@@ -101,22 +210,22 @@ class AirtableAddon(BaseServerAddon):
             name: {"position": None, "matches": False}
             for name in attribute_defs
         }
-        position = 1
 
         if Postgres.pool is None:
             await Postgres.connect()
-        async for row in Postgres.iterate(query):
-            position += 1
-            if row["name"] in attribute_defs:
-                expected_scope = set(attribute_defs[row["name"]]["scope"])
-                if not expected_scope - set(row["scope"]):
-                    found[row["name"]]["matches"] = True
-                found[row["name"]]["position"] = row["position"]
+        # Only the Airtable attributes are needed, look them up by name
+        for row in await Postgres.fetch(query, list(attribute_defs)):
+            if _EXPECTED_SCOPES[row["name"]].issubset(row["scope"]):
+                found[row["name"]]["matches"] = True
+            found[row["name"]]["position"] = row["position"]
 
         # If all attributes match, nothing to do
         if all(attr["matches"] for attr in found.values()):
             return False
 
+        position_rows = await Postgres.fetch(position_query)
+        position = position_rows[0]["position"] + 1
+
         postgre_query = "\n".join(  # noqa: FLY002
             [
                 "INSERT INTO public.attributes",
@@ -130,28 +239,65 @@ class AirtableAddon(BaseServerAddon):
             ]
         )
 
+        rows = []
         for name, attr_def in attribute_defs.items():
-            if not found[name]["matches"]:
-                pos = (
-                    found[name]["position"]
-                    if found[name]["position"] is not None
-                    else position
-                )
-                if found[name]["position"] is None:
-                    position += 1
-                await Postgres.execute(
-                    postgre_query,
-                    name,
-                    pos,
-                    attr_def["scope"],
-                    attr_def["data"],
-                )
+            if found[name]["matches"]:
+                continue
+            pos = found[name]["position"]
+            if pos is None:
+                pos = position
+                position += 1
+            rows.append((name, pos, attr_def["scope"], attr_def["data"]))
+
+        # Write all changed attributes in one round trip and transaction
+        async with Postgres.acquire() as conn, conn.transaction():
+            await conn.executemany(postgre_query, rows)
         return True
 
     @staticmethod
     async def check_airtable_token(api_key: str) -> Dict:
         """Verify if an Airtable API key is valid by listing bases.
 
+        Args:
+            api_key: Your Airtable API key
+
+        Returns:
+            Dict: A dictionary with the validity of the API key and scopes.
+        """
+        # Do not keep raw API keys in memory
+        cache_key = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        # Checks run on the server event loop, the cache is only touched
+        # between awaits and needs no lock
+        cached = _TOKEN_CHECK_CACHE.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        check = _TOKEN_CHECKS_IN_FLIGHT.get(cache_key)
+        if check is None:
+            check = asyncio.ensure_future(
+                AirtableAddon._request_token_check(api_key))
+            _TOKEN_CHECKS_IN_FLIGHT[cache_key] = check
+            check.add_done_callback(
+                lambda _: _TOKEN_CHECKS_IN_FLIGHT.pop(cache_key, None))
+        # A cancelled caller must not cancel the check of the others
+        result = await asyncio.shield(check)
+        if not result["valid"]:
+            # Re-check failed keys, they may be fixed in the meantime
+            _TOKEN_CHECK_CACHE.pop(cache_key, None)
+            return result
+
+        _TOKEN_CHECK_CACHE[cache_key] = (
+            time.monotonic() + TOKEN_CHECK_TTL, result
+        )
+        if len(_TOKEN_CHECK_CACHE) > TOKEN_CHECK_CACHE_SIZE:
+            # Drop the oldest entry
+            del _TOKEN_CHECK_CACHE[next(iter(_TOKEN_CHECK_CACHE))]
+        return result
+
+    @staticmethod
+    async def _request_token_check(api_key: str) -> Dict:
+        """Ask Airtable whether the API key can list bases.
+
         Args:
             api_key: Your Airtable API key
 
@@ -161,9 +307,28 @@ class AirtableAddon(BaseServerAddon):
         url = "https://api.airtable.com/v0/meta/bases"
         headers = {"Authorization": f"Bearer {api_key}"}
 
-        async with httpx.AsyncClient() as client:
+        unreachable = {
+            "valid": False,
+            "scopes": [],
+            "message": "Airtable API is unreachable, try again later."
+        }
+        # Fail fast while Airtable is down instead of waiting for timeouts
+        if not _AIRTABLE_BREAKER.allow():
+            return unreachable
+
+        client = _get_http_client()
+        try:
             http_response = await client.get(url, headers=headers)
-        if http_response.status_code != 200:  # noqa: PLR2004
+        except httpx.HTTPError:
+            _AIRTABLE_BREAKER.record_failure()
+            return unreachable
+
+        if http_response.is_server_error:
+            _AIRTABLE_BREAKER.record_failure()
+            return unreachable
+
+        _AIRTABLE_BREAKER.record_success()
+        if not http_response.is_success:
             return {
                 "valid": False,
                 "scopes": [],
@@ -9,7 +9,7 @@ import logging
 import os
 import subprocess
 import sys
-import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from ayon_api.constants import (
     DEFAULT_VARIANT_ENV_KEY,
@@ -36,40 +36,18 @@ def run_all() -> None:
     leecher = subprocess.Popen(leecher_args)
     processor = subprocess.Popen(processor_args)
     transmitter = subprocess.Popen(transmitter_args)
+    processes = (leecher, processor, transmitter)
+    executor = ThreadPoolExecutor(max_workers=len(processes))
     try:
-        while True:
-            l_poll = leecher.poll()
-            p_poll = processor.poll()
-            t_poll = transmitter.poll()
-            if (
-                l_poll is not None
-                and p_poll is not None
-                and t_poll is not None
-            ):
-                break
-
-            if (
-                l_poll is not None
-                or p_poll is not None
-                or t_poll is not None
-            ):
-                if l_poll is not None:
-                    leecher.kill()
-                if p_poll is not None:
-                    processor.kill()
-                if t_poll is not None:
-                    transmitter.kill()
-
-            time.sleep(0.1)
+        # Block until the first service exits, without polling
+        futures = [executor.submit(proc.wait) for proc in processes]
+        wait(futures, return_when=FIRST_COMPLETED)
     finally:
-        if leecher.poll() is None:
-            leecher.kill()
-
-        if processor.poll() is None:
-            processor.kill()
-
-        if transmitter.poll() is None:
-            transmitter.kill()
+        for proc in processes:
+            if proc.poll() is None:
+                proc.kill()
+        # The waiting threads return once their process is killed
+        executor.shutdown()
 
 
 def main() -> None:
@@ -6,57 +6,136 @@ management,payload retrieval, and event dispatching between
 Airtable and AYON.
 """
 
+from __future__ import annotations
+
+import functools
+import hashlib
 import json
 import logging
 import os
+import random
 import signal
 import sys
 import threading
 import time
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set, Tuple
 
 import ayon_api
-import pyairtable
-from pyairtable.models.webhook import CreateWebhookResponse
+import requests
+
+if TYPE_CHECKING:
+    import pyairtable
+    from pyairtable.models.webhook import (
+        CreateWebhookResponse,
+        WebhookPayload,
+    )
+
+
+# Seconds between re-reads of the addon settings.
+SETTINGS_REFRESH_INTERVAL = 60
+
+# Leeched payloads waiting for or being dispatched to AYON, polling pauses
+# once this many are in flight.
+MAX_PENDING_DISPATCHES = 64
+
+# Seconds before the next poll right after Airtable returned changes.
+ACTIVE_POLL_INTERVAL = 0.05
+# Base of the idle wait, doubled per empty poll up to the poll interval.
+IDLE_POLL_BASE = 0.1
+MAX_EMPTY_POLLS = 10
 
 
-def to_dict(obj: object) -> Union[Dict[str, object], List[object], object]:
-    """Recursively convert an object to a dictionary or list.
+@functools.lru_cache(maxsize=1)
+def load_service_settings() -> Tuple[Dict, Any]:
+    """Load the addon settings and the Airtable secret from AYON.
 
-    Args:
-        obj (object): The object to convert.
+    The result is memoized so constructing the service again, e.g. on a
+    retry, does not query the server again. Use
+    `load_service_settings.cache_clear()` to force a reload.
 
     Returns:
-        Union[Dict[str, object], List[object], object]: The converted
-        dictionary, list, or original object.
+        Tuple[Dict, Any]: The addon settings and the Airtable secret.
     """
-    if isinstance(obj, dict):
-        return {k: to_dict(v) for k, v in obj.items()}
-    if hasattr(obj, "__dict__"):
-        return {k: to_dict(v) for k, v in obj.__dict__.items()}
-    if isinstance(obj, list):
-        return [to_dict(item) for item in obj]
-    return obj
+    settings = ayon_api.get_service_addon_settings()
+    airtable_secret = ayon_api.get_secret(
+        settings["service_settings"]["script_key"])
+    return settings, airtable_secret
 
 
-def serialize_datetime(obj: object) -> Optional[str]:
-    """Serialize a datetime object to ISO format string.
+class CircuitBreaker:
+    """Stop calling Airtable for a while after repeated failures.
 
-    Parameters
-    ----------
-    obj : object
-        The object to check and serialize if it is a datetime.
+    After `fail_max` consecutive failures the breaker opens and calls are
+    skipped until `reset_timeout` seconds have passed, then one call is
+    let through to probe whether Airtable is back. Further calls are
+    skipped for another `reset_timeout` unless the probe succeeds.
+    """
 
-    Returns:
-    -------
-    Optional[str]
-        ISO format string if obj is a datetime, otherwise None.
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 60):
+        """Initialize the breaker in closed state."""
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+
+    def allow(self) -> bool:
+        """Check whether a call may be made.
+
+        Returns:
+            bool: False while the breaker is open, True for the single
+                probe call once `reset_timeout` has passed.
+        """
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        # Restart the timeout, later calls wait for the probe result
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the limit."""
+        self._failures += 1
+        if self._failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """Token bucket keeping requests under Airtable's per-base limit.
+
+    Airtable allows 5 requests per second per base, bursts above it are
+    answered with 429 and a 30 second penalty.
     """
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return None
+
+    def __init__(self, rate: float = 5, capacity: float = 5):
+        """Initialize the bucket full."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, blocking until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait_time = -self._tokens / self.rate
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 
 class AirtableListener:
@@ -80,13 +159,25 @@ class AirtableListener:
         """  # noqa: DOC501
         self.log.info("Initializing the Airtable Listener.")
         self.stop_event = threading.Event()
+        self.breaker = CircuitBreaker()
+        self.rate_limiter = RateLimiter()
+        # Extra wait before the next poll after failures, 0 when healthy
+        self._backoff = 0.0
+        # Consecutive polls without new payloads
+        self._empty_polls = 0
+        # Cursor of the last webhook payload already dispatched
+        self._payload_cursor = 0
+        self._settings_refreshed_at = time.monotonic()
+        # Dispatching to AYON must not delay the next Airtable poll
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=2)
+        self._dispatch_slots = threading.BoundedSemaphore(
+            MAX_PENDING_DISPATCHES)
+        self._apis: Dict[str, pyairtable.Api] = {}
         try:
-            self.settings = ayon_api.get_service_addon_settings()
+            self.settings, airtable_secret = load_service_settings()
             service_settings = self.settings["service_settings"]
             self.airtable_base_name = service_settings["base_name"]
             self.poll_interval = service_settings["poll_interval"]
-            airtable_secret = ayon_api.get_secret(
-                service_settings["script_key"])
             if not isinstance(airtable_secret, dict):
                 msg = (
                     "Airtable API Key not found. Make sure to set it in the "
@@ -112,6 +203,8 @@ class AirtableListener:
         except Exception:
             self.log.exception(
                 "Unable to get Addon settings from the server.")
+            # Fixed settings must be picked up by the next attempt
+            load_service_settings.cache_clear()
             raise
 
         try:
@@ -140,6 +233,7 @@ class AirtableListener:
         """
         self.log.warning("Process stop requested. Terminating process.")
         self.stop_event.set()
+        self._dispatch_pool.shutdown(wait=True)
         # Clean up Airtable connection
         if self.webhook_handler is not None:
             self.webhook_handler.delete()
@@ -151,12 +245,21 @@ class AirtableListener:
             self, airtable_api_key: Optional[str] = None) -> pyairtable.Api:
         """Get Api access token to access Airtable.
 
+        The Api, and with it its connection pool, is created once per key.
+
         Returns:
             pyairtable.Api: Api access
         """
         if airtable_api_key is None:
             airtable_api_key = self.airtable_api_key
-        return pyairtable.Api(self.airtable_api_key)
+        api = self._apis.get(airtable_api_key)
+        if api is None:
+            # pyairtable pulls in pydantic, import it only when needed
+            import pyairtable
+
+            api = pyairtable.Api(airtable_api_key)
+            self._apis[airtable_api_key] = api
+        return api
 
     def get_bases_data_by_api_key(self) -> Dict:
         """Get Airtable bases data by API key.
@@ -166,6 +269,7 @@ class AirtableListener:
         """
         api = self._get_api_token()
         base_urls = api.urls.bases
+        self.rate_limiter.acquire()
         return api.get(base_urls)
 
     def get_base_by_name(
@@ -181,11 +285,26 @@ class AirtableListener:
         api = self._get_api_token()
         if base_name is None:
             base_name = self.airtable_base_name
-        for base_set in bases.values():
-            for base in base_set:
-                if base_name in base["name"]:
-                    return base["id"], api.base(base["id"])
-        return None, None
+        base_ids_by_name = {
+            base["name"]: base["id"]
+            for base_set in bases.values()
+            if isinstance(base_set, list)
+            for base in base_set
+        }
+        # Prefer the exact name, 'Shot' must not resolve to 'Shots'
+        base_id = base_ids_by_name.get(base_name)
+        if base_id is None:
+            base_id = next(
+                (
+                    base_id
+                    for name, base_id in base_ids_by_name.items()
+                    if base_name in name
+                ),
+                None,
+            )
+        if base_id is None:
+            return None, None
+        return base_id, api.base(base_id)
 
     def add_webhook(
             self, webserver_url: Optional[str] = None
@@ -209,6 +328,7 @@ class AirtableListener:
                 }
             }
         }
+        self.rate_limiter.acquire()
         return self.base.add_webhook(webhook_url, spec_data)
 
     def create_webhook(self) -> pyairtable.models.Webhook:
@@ -217,40 +337,60 @@ class AirtableListener:
         Returns:
             pyairtable.models.Webhook: Webhook
         """
-        if self.base.webhooks():
-            for webhook in self.base.webhooks():
-                return webhook
+        self.rate_limiter.acquire()
+        webhooks = self.base.webhooks()
+        if webhooks:
+            return webhooks[0]
         webhook = self.add_webhook()
         webhook_id = webhook.id
+        self.rate_limiter.acquire()
         return self.base.webhook(webhook_id)
 
     def get_payloads(self) -> Dict:
-        """Get all webhook payloads data from Airtable.
+        """Get the webhook payloads Airtable added since the last poll.
+
+        Airtable keeps payloads around for days, the cursor of the last
+        fetched one is stored so each payload is dispatched only once.
 
         Returns:
-            Dict: payloads data
+            Dict: payloads data, empty while Airtable is failing.
         """
-        try:
-            airtable_webhook_payloads = self.webhook_handler.payloads()
-            airtable_payloads = {
-                i: to_dict(payload) for i, payload in
-                enumerate(airtable_webhook_payloads)
-            }
-        except Exception:  # noqa: BLE001
-            airtable_payloads = {}
-            self.log.info("No payload data found from Airtable's webhook.")
-
-        seralize_payloads = json.dumps(
-                airtable_payloads, default=serialize_datetime
-            )
-        seen = set()
+        if not self.breaker.allow():
+            return {}
+        self.rate_limiter.acquire()
         unique_payloads = {}
+        try:
+            new_payloads = list(self.webhook_handler.payloads(
+                cursor=self._payload_cursor + 1))
+            unique_payloads = self.deduplicate_payloads(new_payloads)
+        except requests.exceptions.RetryError:
+            # pyairtable already retried the 429 responses
+            self.log.warning("Airtable rate limit exceeded, backing off.")
+            self._increase_backoff()
+        except requests.HTTPError as exc:
+            status_code = getattr(exc.response, "status_code", 0)
+            if status_code >= 500:  # noqa: PLR2004
+                self.breaker.record_failure()
+            else:
+                self.log.exception("Airtable rejected payloads request.")
+            self._increase_backoff()
+        except (requests.ConnectionError, requests.Timeout):
+            self.log.warning("Airtable is unreachable, backing off.")
+            self.breaker.record_failure()
+            self._increase_backoff()
+        except Exception:
+            self.log.exception("Unexpected error fetching webhook payloads.")
+            self.breaker.record_failure()
+            self._increase_backoff()
+        else:
+            self.breaker.record_success()
+            self._backoff = 0.0
+            if new_payloads:
+                # Payloads come in cursor order
+                self._payload_cursor = new_payloads[-1].cursor
+            self.log.debug(
+                "Fetched %s unique webhook payloads.", len(unique_payloads))
 
-        for payload in json.loads(seralize_payloads).values():
-            signature = json.dumps(payload, sort_keys=True)
-            if signature not in seen:
-                seen.add(signature)
-                unique_payloads[str(len(seralize_payloads))] = payload
         return {
             "action": "airtable-leech",
             "webhook_id": self.webhook_handler.id,
@@ -258,28 +398,147 @@ class AirtableListener:
             "airtable_payloads": unique_payloads
         }
 
+    def _maybe_refresh_settings(self) -> None:
+        """Re-read the addon settings at most once per minute.
+
+        Lets the poll interval follow settings changes without
+        restarting the service.
+        """
+        now = time.monotonic()
+        if now - self._settings_refreshed_at < SETTINGS_REFRESH_INTERVAL:
+            return
+        self._settings_refreshed_at = now
+        try:
+            settings = ayon_api.get_service_addon_settings()
+        except requests.RequestException:
+            self.log.warning(
+                "Unable to refresh Addon settings.", exc_info=True)
+            return
+        self.settings = settings
+        self.poll_interval = settings["service_settings"]["poll_interval"]
+
+    def _increase_backoff(self) -> None:
+        """Double the wait before the next poll, with jitter."""
+        self._backoff = (
+            min(60.0, max(self.poll_interval, self._backoff * 2))
+            + random.uniform(0, 1)  # noqa: S311
+        )
+
+    @staticmethod
+    def deduplicate_payloads(
+            payloads: Iterable[WebhookPayload]) -> Dict[str, Dict]:
+        """Serialize webhook payloads, dropping duplicates.
+
+        Args:
+            payloads (Iterable[WebhookPayload]): Airtable webhook payloads.
+
+        Returns:
+            Dict[str, Dict]: Unique JSON serializable payloads keyed by
+                their consecutive position.
+        """
+        seen: Set[int] = set()
+        unique_payloads = {}
+        for payload in payloads:
+            # Pydantic serializes nested models and datetimes natively
+            payload_data = payload.model_dump(mode="json")
+            # Keep only a 64-bit integer digest of the canonical JSON
+            signature = int.from_bytes(
+                hashlib.blake2b(
+                    json.dumps(
+                        payload_data, sort_keys=True, separators=(",", ":")
+                    ).encode(),
+                    digest_size=8,
+                ).digest(),
+                "big",
+            )
+            if signature not in seen:
+                seen.add(signature)
+                unique_payloads[str(len(unique_payloads))] = payload_data
+        return unique_payloads
+
+    @staticmethod
+    def dispatch_payload(payload: Dict) -> None:
+        """Dispatch the leeched payload as an AYON event.
+
+        Args:
+            payload (Dict): The payload data from `get_payloads`.
+        """
+        payload_id = str(uuid.uuid4())
+        # Inject identifiers
+        payload["payload_id"] = payload_id
+        description = f"Leeched {payload['action']}"
+        ayon_api.dispatch_event(
+            "airtable.leech",
+            sender=ayon_api.ServiceContext.service_name,
+            event_hash=payload_id,
+            description=description,
+            payload=payload
+        )
+
+    def _on_dispatch_done(self, future: Future) -> None:
+        """Log errors of a dispatch running in the pool."""
+        self._dispatch_slots.release()
+        if future.cancelled():
+            self.log.warning("Dispatch of leeched payload was cancelled.")
+            return
+        exc = future.exception()
+        if exc is not None:
+            self.log.error(
+                "Failed to dispatch leeched payload.", exc_info=exc)
+
     def start_listening(self) -> None:
         """Main loop querying the Airtable database for new events."""
         self.log.info("Start listening for Airtable Events...")
-        while not self.stop_event.is_set():
+        while True:
+            self._maybe_refresh_settings()
+            previous_cursor = self._payload_cursor
             try:
-                payload_id = str(uuid.uuid4())
-                # Get the payload and inject identifiers
                 payload = self.get_payloads()
-                payload["payload_id"] = payload_id
-                description = f"Leeched {payload['action']}"
-                ayon_api.dispatch_event(
-                    "airtable.leech",
-                    sender=ayon_api.ServiceContext.service_name,
-                    event_hash=payload_id,
-                    description=description,
-                    payload=payload
-                )
+                # Nothing is dispatched while the breaker is open or when
+                # Airtable has no new changes
+                if payload and payload["airtable_payloads"]:
+                    # Blocks while too many dispatches are pending, the
+                    # next Airtable poll waits for a free slot
+                    self._dispatch_slots.acquire()
+                    try:
+                        future = self._dispatch_pool.submit(
+                            self.dispatch_payload, payload)
+                    except RuntimeError:
+                        # The pool is shut down, dispatch in this thread so
+                        # the payload past the cursor is not lost
+                        self._dispatch_slots.release()
+                        self.dispatch_payload(payload)
+                    else:
+                        future.add_done_callback(self._on_dispatch_done)
+
+            except Exception:
+                self.log.exception("Error in leecher.")
+
+            # Only payloads past the stored cursor count as activity
+            payload_count = self._payload_cursor - previous_cursor
+            # Returns right away when a shutdown is requested
+            wait = self._backoff or self._next_poll_wait(payload_count)
+            if self.stop_event.wait(wait):
+                break
+
+    def _next_poll_wait(self, payload_count: int) -> float:
+        """Get the wait before the next poll based on recent activity.
+
+        Polls follow each other quickly while changes keep coming and
+        slow down towards `poll_interval` once Airtable is quiet.
 
-            except Exception as e:
-                self.log.exception(f"Error in leecher: {e}")  # noqa: G004, TRY401
+        Args:
+            payload_count (int): Number of new payloads the last poll
+                fetched after the stored cursor.
 
-            time.sleep(self.poll_interval)
+        Returns:
+            float: Seconds to wait before the next poll.
+        """
+        if payload_count:
+            self._empty_polls = 0
+            return min(self.poll_interval, ACTIVE_POLL_INTERVAL)
+        self._empty_polls = min(self._empty_polls + 1, MAX_EMPTY_POLLS)
+        return min(self.poll_interval, IDLE_POLL_BASE * 2 ** self._empty_polls)
 
 
 def service_main() -> None:
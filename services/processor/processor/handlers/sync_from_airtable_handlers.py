@@ -6,16 +6,47 @@ AYON entities.
 """
 
 import logging
-from typing import Dict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 import pyairtable
 from ayon_api.entity_hub import EntityHub
+from pyairtable.formulas import EQ, OR, RECORD_ID
 
 log = logging.getLogger(__name__)
 
 AIRTABLE_ID_ATTRIB = "airtableId"
 AIRTABLE_PATH_ATTRIB = "airtablePath"
 
+# Records matched by one formula, Airtable pages hold up to 100 records.
+RECORD_IDS_CHUNK_SIZE = 100
+
+# Maximum number of projects committed to AYON at the same time.
+COMMIT_MAX_WORKERS = 4
+
+# Newest base transaction number synced per (base, table, record), used to
+# skip records already synced after a replayed or duplicated change.
+SYNCED_RECORDS_CACHE_SIZE = 4096
+_SYNCED_TRANSACTIONS: "OrderedDict[Tuple[str, str, str], int]" = OrderedDict()
+
+
+def serialize_value(value: Any) -> Any:  # noqa: ANN401
+    """Serialize a field value to avoid new lines and trailing backslashes.
+
+    Args:
+        value (Any): The value of an Airtable record field.
+
+    Returns:
+        Any: The serialized value, non-string values are returned as is.
+    """
+    if not isinstance(value, str):
+        return value
+    value = value.replace("\n", "")
+    if value.endswith("\\"):
+        value += "\\"
+    return value
+
 
 def serialize_fields(target_fields: Dict) -> Dict:
     """Serialize the fields from Airtable record to avoid new lines and
@@ -28,17 +59,10 @@ def serialize_fields(target_fields: Dict) -> Dict:
     Returns:
         Dict: A serialized attributes map.
     """  # noqa: D205
-    result = {}
-    for key, value in target_fields.items():
-        if isinstance(value, str):
-            val = value.replace("\n", "")
-            if val.endswith("\\"):
-                val += "\\"
-            result[key] = val
-        else:
-            result[key] = value
-
-    return result
+    return {
+        key: serialize_value(value)
+        for key, value in target_fields.items()
+    }
 
 
 def parse_useful_payloads(payload: Dict) -> Dict:
@@ -52,6 +76,8 @@ def parse_useful_payloads(payload: Dict) -> Dict:
 
     Returns:
         Dict: A dictionary containing the base ID and changed tables IDs.
+            Changed records of a table map to the newest base transaction
+            number that touched them.
 
     """
     base_id = payload["base_id"]
@@ -65,11 +91,15 @@ def parse_useful_payloads(payload: Dict) -> Dict:
         }
 
     for payload_data in airtable_payload.values():
+        transaction = payload_data.get("base_transaction_number", -1)
         changed_tables = payload_data.get("changed_tables_by_id", {})
         for table_id, changed_data in changed_tables.items():
-            changed_record_by_tables_ids[table_id] = set()
-            for record_by_id in changed_data.get("changed_records_by_id", {}):
-                changed_record_by_tables_ids[table_id].add(record_by_id)
+            # Several payloads may touch the same table, merge records
+            table_records = changed_record_by_tables_ids.setdefault(
+                table_id, {})
+            for record_id in changed_data.get("changed_records_by_id", {}):
+                table_records[record_id] = max(
+                    table_records.get(record_id, -1), transaction)
 
     return {
         "base_id": base_id,
@@ -79,13 +109,13 @@ def parse_useful_payloads(payload: Dict) -> Dict:
 
 def sync_projects_from_airtable(
         api: pyairtable.Api, payload: Dict,
-        required_fields: list, attribs_map: Dict) -> None:
+        required_fields: FrozenSet[str], attribs_map: Dict) -> None:
     """Sync projects from Airtable to AYON.
 
     Args:
         api (pyairtable.Api): access to Airtable API
         payload (Dict): The payload data from the event.
-        required_fields (list): required fields to check in the
+        required_fields (FrozenSet[str]): required fields to check in the
         Airtable record.
         attribs_map (Dict): attributes mapping from AYON to Airtable.
     """
@@ -93,17 +123,23 @@ def sync_projects_from_airtable(
     base_id = parsed_payload["base_id"]
     base = api.base(base_id)
     base_meta_url = base.urls.meta
+    # Entity hubs and status names per project, shared by all records
+    entity_hubs: Dict[str, Tuple[EntityHub, Set[str]]] = {}
+    # Synced records per project, marked once their project is committed
+    synced_records: Dict[str, List[Tuple[str, str, int]]] = {}
     if parsed_payload.get("changed_tables_ids", {}):
         for table_id, record_ids in parsed_payload["changed_tables_ids"].items():  # noqa: E501
             table = base.table(table_id)
-            for record_id in record_ids:
+            pending_records = filter_synced_records(
+                base_id, table_id, record_ids)
+            for record in iter_records_by_ids(
+                table, list(pending_records), list(required_fields)
+            ):
+                record_id = record["id"]
                 try:
-                    record = table.get(record_id)
                     log.info("Processing record: %s", record)
                     target_fields = record.get("fields", {})
-                    if not all(
-                        field in target_fields for field in required_fields
-                    ):
+                    if not required_fields.issubset(target_fields):
                         log.warning(
                             "Record %s does not have 'Project', 'Status', "
                             "or 'VersionId' fields.",
@@ -114,17 +150,180 @@ def sync_projects_from_airtable(
                         base_id,
                         base_meta_url,
                         target_fields,
-                        attribs_map
+                        attribs_map,
+                        entity_hubs=entity_hubs,
                     )
                 except Exception:
                     log.exception(
                         "Error processing record %s",
                         record_id
                     )
+                    continue
+                project = serialize_value(
+                    target_fields[attribs_map["project"]])
+                synced_records.setdefault(project, []).append(
+                    (table_id, record_id, pending_records.get(record_id, -1))
+                )
+
+    for project in commit_entity_hubs(entity_hubs):
+        for table_id, record_id, transaction in synced_records.get(
+                project, []):
+            mark_record_synced(base_id, table_id, record_id, transaction)
+
+
+def commit_entity_hubs(
+        entity_hubs: Dict[str, Tuple[EntityHub, Set[str]]]) -> Set[str]:
+    """Commit the changes of several projects concurrently.
+
+    Each project has its own EntityHub, so their commits do not share
+    state and can run in parallel threads.
+
+    Args:
+        entity_hubs (Dict[str, Tuple[EntityHub, Set[str]]]): Entity hubs
+            and status names by project name.
+
+    Returns:
+        Set[str]: Names of the projects committed successfully.
+    """
+    committed: Set[str] = set()
+    if not entity_hubs:
+        return committed
+    workers = min(len(entity_hubs), COMMIT_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(entity_hub.commit_changes): project_name
+            for project_name, (entity_hub, _) in entity_hubs.items()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                log.exception(
+                    "Error committing changes of project %s", futures[future])
+            else:
+                committed.add(futures[future])
+    return committed
+
+
+def filter_synced_records(
+        base_id: str, table_id: str,
+        record_ids: Dict[str, int]) -> Dict[str, int]:
+    """Drop records already fetched after their newest change.
+
+    Replayed events and duplicated webhook payloads reference changes that
+    were already synced, such records are not fetched again.
+
+    Args:
+        base_id (str): ID of the Airtable base.
+        table_id (str): ID of the Airtable table.
+        record_ids (Dict[str, int]): Newest base transaction number by
+            changed record ID.
+
+    Returns:
+        Dict[str, int]: Records that still have to be synced.
+    """
+    result = {}
+    for record_id, transaction in record_ids.items():
+        synced = _SYNCED_TRANSACTIONS.get((base_id, table_id, record_id))
+        if transaction < 0 or synced is None or synced < transaction:
+            result[record_id] = transaction
+        else:
+            log.debug(
+                "Record %s was already synced after transaction %s.",
+                record_id,
+                transaction,
+            )
+    return result
+
+
+def mark_record_synced(
+        base_id: str, table_id: str, record_id: str,
+        transaction: int) -> None:
+    """Remember the newest base transaction synced for a record.
+
+    Args:
+        base_id (str): ID of the Airtable base.
+        table_id (str): ID of the Airtable table.
+        record_id (str): ID of the fetched record.
+        transaction (int): Newest base transaction number of its changes.
+    """
+    if transaction < 0:
+        return
+    key = (base_id, table_id, record_id)
+    _SYNCED_TRANSACTIONS[key] = max(
+        _SYNCED_TRANSACTIONS.get(key, -1), transaction)
+    _SYNCED_TRANSACTIONS.move_to_end(key)
+    if len(_SYNCED_TRANSACTIONS) > SYNCED_RECORDS_CACHE_SIZE:
+        _SYNCED_TRANSACTIONS.popitem(last=False)
+
+
+def iter_records_by_ids(
+        table: pyairtable.Table,
+        record_ids: List[str],
+        fields: List[str]) -> Iterator[Dict]:
+    """Iterate records by their IDs with as few requests as possible.
+
+    Records are matched with a `RECORD_ID()` formula in chunks of
+    `RECORD_IDS_CHUNK_SIZE` IDs, each chunk fits a single page.
+
+    Args:
+        table (pyairtable.Table): The Airtable table to read.
+        record_ids (List[str]): IDs of the records to fetch.
+        fields (List[str]): Only these fields are returned.
+
+    Yields:
+        Dict: The Airtable records.
+    """
+    for idx in range(0, len(record_ids), RECORD_IDS_CHUNK_SIZE):
+        chunk = record_ids[idx:idx + RECORD_IDS_CHUNK_SIZE]
+        formula = OR(*(EQ(RECORD_ID(), record_id) for record_id in chunk))
+        for page in table.iterate(
+            formula=formula,
+            fields=fields,
+            page_size=RECORD_IDS_CHUNK_SIZE,
+        ):
+            yield from page
+
+
+def get_project_entity_hub(
+        project: str,
+        entity_hubs: Dict[str, Tuple[EntityHub, Set[str]]]
+) -> Tuple[EntityHub, Set[str]]:
+    """Get the cached EntityHub and status names of a project.
+
+    Args:
+        project (str): Name of the AYON project.
+        entity_hubs (Dict[str, Tuple[EntityHub, Set[str]]]): Cache of
+            entity hubs and status names by project name.
+
+    Returns:
+        Tuple[EntityHub, Set[str]]: The entity hub and status names.
+
+    Raises:
+        ValueError: If unable to get EntityHub for the project.
+    """
+    cached = entity_hubs.get(project)
+    if cached is not None:
+        return cached
+    try:
+        ayon_entity_hub = EntityHub(project)
+        project_entity = ayon_entity_hub.project_entity
+    except ValueError as e:
+        msg = f"Unable to get EntityHub for project '{project}': {e}"
+        raise ValueError(msg) from e
+
+    status_names = {status.name for status in project_entity.statuses}
+    entity_hubs[project] = (ayon_entity_hub, status_names)
+    return ayon_entity_hub, status_names
 
 
-def sync_from_airtable_to_ayon(base_id: str, base_url: str,
-                               target_fields: Dict, attribs_map: Dict) -> None:
+def sync_from_airtable_to_ayon(
+        base_id: str,
+        base_url: str,
+        target_fields: Dict,
+        attribs_map: Dict,
+        entity_hubs: Optional[Dict[str, Tuple[EntityHub, Set[str]]]] = None
+) -> None:
     """Sync data from Airtable to AYON.
 
     Args:
@@ -132,6 +331,10 @@ def sync_from_airtable_to_ayon(base_id: str, base_url: str,
         base_url (str): meta url of the Airtable base.
         target_fields (Dict): target fields from the Airtable record.
         attribs_map (Dict): attributes mapping from AYON to Airtable.
+        entity_hubs (Optional[Dict[str, Tuple[EntityHub, Set[str]]]]):
+            Shared cache of entity hubs by project. When passed, the
+            caller commits the changes, otherwise they are committed
+            right away.
 
     Raises:
         ValueError: If unable to get EntityHub for the project, if the entity
@@ -139,17 +342,16 @@ def sync_from_airtable_to_ayon(base_id: str, base_url: str,
             or if the entity is immutable.
 
     """
-    target_fields = serialize_fields(target_fields)
+    # Only the mapped fields are used, serialize just those
     airtable_project = attribs_map["project"]
-    project = target_fields[airtable_project]
+    project = serialize_value(target_fields[airtable_project])
     airtable_version_id = attribs_map["version_id"]
-    version_id = target_fields[airtable_version_id]
-    try:
-        ayon_entity_hub = EntityHub(project)
-        project_entity = ayon_entity_hub.project_entity
-    except ValueError as e:
-        msg = f"Unable to get EntityHub for project '{project}': {e}"
-        raise ValueError(msg) from e
+    version_id = serialize_value(target_fields[airtable_version_id])
+    commit = entity_hubs is None
+    if entity_hubs is None:
+        entity_hubs = {}
+    ayon_entity_hub, all_status_attribs_matched = get_project_entity_hub(
+        project, entity_hubs)
 
     ayon_entity = ayon_entity_hub.get_or_query_entity_by_id(
         version_id, ["version"])
@@ -164,10 +366,7 @@ def sync_from_airtable_to_ayon(base_id: str, base_url: str,
         raise ValueError(msg)
 
     airtable_status = attribs_map["status"]
-    all_status_attribs_matched = {
-        status.name for status in project_entity.statuses
-    }
-    new_status = target_fields[airtable_status]
+    new_status = serialize_value(target_fields[airtable_status])
     if new_status in all_status_attribs_matched:
         ayon_entity.status = new_status
     else:
@@ -194,4 +393,5 @@ def sync_from_airtable_to_ayon(base_id: str, base_url: str,
             base_url
         )
 
-    ayon_entity_hub.commit_changes()
+    if commit:
+        ayon_entity_hub.commit_changes()
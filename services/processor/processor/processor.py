@@ -6,18 +6,46 @@ related to Airtable integration, including event enrollment, synchronization
 of projects from Airtable, API authentication, and polling intervals.
 """
 
+import functools
 import logging
+import random
 import sys
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import ayon_api
 import pyairtable
 
 from .handlers.sync_from_airtable_handlers import sync_projects_from_airtable
 
+# Shortest idle wait in seconds, doubled on every empty enroll up to the
+# poll interval.
+IDLE_BACKOFF_MIN = 0.05
+# Upper bound in seconds of the random jitter added to idle waits.
+IDLE_BACKOFF_JITTER = 0.1
+# Maximum number of events enrolled and fetched per loop iteration.
+EVENT_BATCH_SIZE = 8
+
+
+@functools.lru_cache(maxsize=1)
+def load_service_settings() -> Tuple[Dict, Any]:
+    """Load the addon settings and the Airtable secret from AYON.
+
+    The result is memoized so constructing the service again, e.g. on a
+    retry, does not query the server again. Use
+    `load_service_settings.cache_clear()` to force a reload.
+
+    Returns:
+        Tuple[Dict, Any]: The addon settings and the Airtable secret.
+    """
+    settings = ayon_api.get_service_addon_settings()
+    airtable_secret = ayon_api.get_secret(
+        settings["service_settings"]["script_key"])
+    return settings, airtable_secret
+
 
 class AirtableProcessor:
     """Processes AYON events related to Airtable integration.
@@ -36,14 +64,23 @@ class AirtableProcessor:
             TypeError: If the Airtable API Key is not found or is not a dict.
         """
         self.log.info("Initializing the Airtable Processor.")
+        self._apis: Dict[str, pyairtable.Api] = {}
 
         try:
-            self.settings = ayon_api.get_service_addon_settings()
+            self.settings, airtable_secret = load_service_settings()
             service_settings = self.settings["service_settings"]
             self.attribs_map = self.settings["attribute_maps"]
+            # Airtable fields every synced record must have
+            self.required_fields = frozenset(
+                field
+                for field in (
+                    self.attribs_map.get("project"),
+                    self.attribs_map.get("status"),
+                    self.attribs_map.get("version_id"),
+                )
+                if field
+            )
             self.poll_interval = service_settings["poll_interval"]
-            airtable_secret = ayon_api.get_secret(
-                service_settings["script_key"])
             if not isinstance(airtable_secret, dict):
                 msg = (
                     "Airtable API Key not found. Make sure to set it in the "
@@ -63,6 +100,8 @@ class AirtableProcessor:
         except Exception:
             self.log.exception("Unable to get Addon settings from the server.")
             self.log.exception(traceback.format_exc())
+            # Fixed settings must be picked up by the next attempt
+            load_service_settings.cache_clear()
             raise
 
     def handle_airtable_event(self, payload: Dict) -> None:
@@ -71,20 +110,14 @@ class AirtableProcessor:
         if not payload:
             self.log.warning("No payload found in the event.")
             return
-        required_fields = [
-            self.attribs_map.get("project"),
-            self.attribs_map.get("status"),
-            self.attribs_map.get("version_id"),
-        ]
-        required_fields = [field for field in required_fields if field]
-        if not required_fields:
+        if not self.required_fields:
             self.log.warning("No required fields found in the settings.")
             return
         api = self._get_api_token()
         sync_projects_from_airtable(
             api,
             payload,
-            required_fields,
+            self.required_fields,
             self.attribs_map
         )
 
@@ -92,6 +125,8 @@ class AirtableProcessor:
             self, airtable_api_key: Optional[str] = None) -> pyairtable.Api:
         """Get the Airtable API token.
 
+        The Api, and with it its connection pool, is created once per key.
+
         Args:
             airtable_api_key (Optional[str]): The Airtable API key to use.
             If None, uses the instance's API key.
@@ -101,82 +136,163 @@ class AirtableProcessor:
         """
         if airtable_api_key is None:
             airtable_api_key = self.airtable_api_key
-        return pyairtable.Api(airtable_api_key)
+        api = self._apis.get(airtable_api_key)
+        if api is None:
+            api = pyairtable.Api(airtable_api_key)
+            self._apis[airtable_api_key] = api
+        return api
+
+    @staticmethod
+    def _enroll_events() -> List[Dict]:
+        """Enroll up to `EVENT_BATCH_SIZE` pending `airtable.leech` events.
+
+        Returns:
+            List[Dict]: Enrolled event jobs, empty when the queue is idle.
+        """
+        events = []
+        while len(events) < EVENT_BATCH_SIZE:
+            event = ayon_api.enroll_event_job(
+                "airtable.leech",
+                "airtable.proc",
+                sender=ayon_api.get_service_name(),
+                description="Event processing",
+                max_retries=2,
+                sequential=False,
+            )
+            if not event:
+                break
+            events.append(event)
+        return events
+
+    def _fail_event(self, event: Dict, message: str) -> None:
+        """Mark an event as failed.
+
+        Args:
+            event (Dict): The enrolled event job.
+            message (str): Error message stored in the event payload.
+        """
+        try:
+            ayon_api.update_event(
+                event["id"],
+                status="failed",
+                payload={
+                    "message": message,
+                },
+            )
+        except Exception:
+            self.log.exception("Error failing event %s", event["id"])
+
+    def process_event(self, event: Dict, source_event: Dict) -> None:
+        """Process one enrolled event and report its status.
+
+        Args:
+            event (Dict): The enrolled event job.
+            source_event (Dict): The `airtable.leech` event it depends on.
+        """
+        payload = source_event["payload"]
+        table_event_id = source_event["id"]
+        failed = False
+
+        if payload.get("action") == "airtable-leech":
+            try:
+                self.log.info(
+                    "Running the Handler handle_airtable_event"
+                )
+                ayon_api.update_event(
+                    event["id"],
+                    description=(
+                        "Processing event with Handler "
+                        f"{payload['action']}..."
+                    ),
+                    status="in_progress",
+                )
+                # Formatting a large payload is only worth it when shown
+                if self.log.isEnabledFor(logging.DEBUG):
+                    self.log.debug("processing event %s", pformat(payload))
+                self.handle_airtable_event(payload)
+
+            except Exception:
+                failed = True
+                self.log.exception(
+                    "Unable to process handler handle_airtable_event"
+                )
+                ayon_api.update_event(
+                    event["id"],
+                    status="failed",
+                    description=(
+                        "An error occurred while processing "
+                        f"{table_event_id}"
+                    ),
+                    payload={
+                        "message": traceback.format_exc(),
+                    },
+                )
+
+        if not failed:
+            self.log.info(
+                "Event has been processed... setting to finished!")
+            ayon_api.update_event(
+                event["id"],
+                description=(
+                    f"Event processed successfully {table_event_id}"
+                ),
+                status="finished",
+            )
 
     def start_processing(self) -> None:
         """Enroll AYON events of topic `airtable.leech` and.
 
         process them using handle_airtable_event.
+
+        Events are enrolled in batches and their source events are fetched
+        in parallel, the handlers still run one event at a time in order.
         """
-        while True:
-            try:
+        idle_backoff = 0.0
+        with ThreadPoolExecutor(max_workers=EVENT_BATCH_SIZE) as executor:
+            while True:
+                try:
+                    events = self._enroll_events()
+                except Exception:
+                    self.log.exception(traceback.format_exc())
+                    events = []
 
-                event = ayon_api.enroll_event_job(
-                    "airtable.leech",
-                    "airtable.proc",
-                    sender=ayon_api.get_service_name(),
-                    description="Event processing",
-                    max_retries=2,
-                    sequential=False,
-                )
-                if not event:
+                if not events:
+                    # Back off while idle, a busy queue is drained
+                    # back-to-back without waiting.
+                    idle_backoff = min(
+                        max(idle_backoff * 2, IDLE_BACKOFF_MIN),
+                        self.poll_interval,
+                    )
                     self.log.debug(
-                        "No event found, sleeping for poll interval."
+                        "No event found, sleeping for %.2f seconds.",
+                        idle_backoff,
+                    )
+                    time.sleep(
+                        idle_backoff
+                        + random.random() * IDLE_BACKOFF_JITTER  # noqa: S311
                     )
-                    time.sleep(self.poll_interval)
                     continue
 
-                source_event = ayon_api.get_event(event["dependsOn"])
-                payload = source_event["payload"]
-                table_event_id = source_event["id"]
-                failed = False
-
-                if payload.get("action") == "airtable-leech":
+                idle_backoff = 0.0
+                get_event = ayon_api.get_event
+                pending = [
+                    (event, executor.submit(get_event, event["dependsOn"]))
+                    for event in events
+                ]
+                for event, source_future in pending:
                     try:
-                        self.log.info(
-                            "Running the Handler handle_airtable_event"
-                        )
-                        ayon_api.update_event(
-                            event["id"],
-                            description=(
-                                "Processing event with Handler "
-                                f"{payload['action']}..."
-                            ),
-                            status="in_progress",
-                        )
-                        self.log.debug(f"processing event {pformat(payload)}")  # noqa: G004
-                        self.handle_airtable_event(payload)
-
+                        source_event = source_future.result()
                     except Exception:
-                        failed = True
+                        # Without its source event the job can never run,
+                        # fail it instead of leaving it in progress
                         self.log.exception(
-                            "Unable to process handler handle_airtable_event"
-                        )
-                        ayon_api.update_event(
-                            event["id"],
-                            status="failed",
-                            description=(
-                                "An error occurred while processing "
-                                f"{table_event_id}"
-                            ),
-                            payload={
-                                "message": traceback.format_exc(),
-                            },
-                        )
-
-                if not failed:
-                    self.log.info(
-                        "Event has been processed... setting to finished!")
-                    ayon_api.update_event(
-                        event["id"],
-                        description=(
-                            f"Event processed successfully {table_event_id}"
-                        ),
-                        status="finished",
-                    )
-
-            except Exception:
-                self.log.exception(traceback.format_exc())
+                            "Unable to get source event of %s", event["id"])
+                        self._fail_event(event, traceback.format_exc())
+                        continue
+                    try:
+                        self.process_event(event, source_event)
+                    except Exception:
+                        self.log.exception(traceback.format_exc())
 
 
 def service_main() -> None:
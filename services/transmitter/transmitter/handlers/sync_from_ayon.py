@@ -5,11 +5,167 @@ AYON entities with Airtable records.
 """
 
 import logging
-from typing import Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import ayon_api
 import pyairtable
+import requests
 from ayon_api.entity_hub import EntityHub
+from pyairtable.formulas import match
+
+# Seconds for which a looked up record ID is reused.
+RECORD_ID_CACHE_TTL = 300
+RECORD_ID_CACHE_SIZE = 1024
+
+# AYON keys identifying the Airtable record of an event, by event topic.
+MATCH_KEYS_BY_TOPIC = {
+    "entity.version.created": ("project", "product_name"),
+    "entity.version.status_changed": ("project", "product_name", "version_id"),
+}
+
+# Records per Airtable batch request, the API accepts at most 10.
+UPSERT_BATCH_SIZE = 10
+# Events whose AYON data is read at the same time.
+PARSE_MAX_WORKERS = 5
+# Records written at the same time when they cannot be batched, kept under
+# the Airtable limit of 5 requests per second per base.
+WRITE_MAX_WORKERS = 4
+
+# Record IDs by (base ID, table name, matched field values) as
+# (expiry time, record ID), shared by the hubs of all events.
+_RECORD_IDS: Dict[Tuple, Tuple[float, str]] = {}
+_RECORD_IDS_LOCK = threading.Lock()
+# Tables by (base ID, table name)
+_TABLES: Dict[Tuple[str, str], pyairtable.Table] = {}
+# Airtable field types by field name, by (base ID, table name)
+_FIELD_TYPES: Dict[Tuple[str, str], Dict[str, str]] = {}
+# Tasks by (project name, task ID), shared by the parse workers
+TASK_CACHE_SIZE = 4096
+_TASKS: Dict[Tuple[str, str], Optional[Dict]] = {}
+_TASKS_LOCK = threading.Lock()
+
+
+def get_task(project_name: str, task_id: str) -> Optional[Dict]:
+    """Get a task of a project, memoized for repeated versions of a task.
+
+    Args:
+        project_name (str): Name of the project.
+        task_id (str): ID of the task.
+
+    Returns:
+        Optional[Dict]: The task with its name and type, None if not found.
+    """
+    key = (project_name, task_id)
+    with _TASKS_LOCK:
+        if key in _TASKS:
+            return _TASKS[key]
+    task = ayon_api.get_task_by_id(
+        project_name, task_id, fields=["type", "name"])
+    _cache_tasks(project_name, {task_id: task})
+    return task
+
+
+def prefetch_tasks(project_name: str, version_ids: List[str]) -> None:
+    """Cache the tasks of several versions with two bulk queries.
+
+    Args:
+        project_name (str): Name of the project.
+        version_ids (List[str]): IDs of the versions to sync.
+    """
+    versions = ayon_api.get_versions(
+        project_name, version_ids=version_ids, fields={"id", "taskId"})
+    with _TASKS_LOCK:
+        task_ids = {
+            version["taskId"]
+            for version in versions
+            if version.get("taskId")
+            and (project_name, version["taskId"]) not in _TASKS
+        }
+    if not task_ids:
+        return
+    tasks = {
+        task["id"]: task
+        for task in ayon_api.get_tasks(
+            project_name, task_ids=task_ids, fields={"id", "type", "name"})
+    }
+    _cache_tasks(
+        project_name, {task_id: tasks.get(task_id) for task_id in task_ids})
+
+
+def _cache_tasks(project_name: str, tasks: Dict[str, Optional[Dict]]) -> None:
+    """Store tasks by ID, dropping the oldest entries when full.
+
+    Args:
+        project_name (str): Name of the project.
+        tasks (Dict[str, Optional[Dict]]): Tasks by task ID.
+    """
+    with _TASKS_LOCK:
+        for task_id, task in tasks.items():
+            if len(_TASKS) >= TASK_CACHE_SIZE:
+                _TASKS.pop(next(iter(_TASKS)))
+            _TASKS[project_name, task_id] = task
+
+
+def _to_number(value: object) -> object:
+    """Convert a value to a number, keeping it when it is not numeric.
+
+    Args:
+        value (object): Value to convert, e.g. a padded version "003".
+
+    Returns:
+        object: The int or float value, or the original value.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_text(value: object) -> object:
+    """Convert a value to text, joining list items.
+
+    Args:
+        value (object): Value to convert, e.g. a list of tags.
+
+    Returns:
+        object: The value as a string.
+    """
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+def _to_list(value: object) -> object:
+    """Wrap a single value in a list.
+
+    Args:
+        value (object): Value to wrap.
+
+    Returns:
+        object: The value as a list.
+    """
+    return value if isinstance(value, list) else [value]
+
+
+# Local conversions by Airtable field type, values of other types are sent
+# as they are.
+FIELD_COERCERS = {
+    "number": _to_number,
+    "currency": _to_number,
+    "percent": _to_number,
+    "singleLineText": _to_text,
+    "multilineText": _to_text,
+    "multipleSelects": _to_list,
+}
 
 
 class AyonAirtableHub:
@@ -19,9 +175,24 @@ class AyonAirtableHub:
     corresponding records in Airtable.
     """
 
+    # One hub is created per event, keep instances small
+    __slots__ = (
+        "_cached_hub",
+        "api_key",
+        "attrib_map",
+        "base",
+        "payload",
+        "project_name",
+        "summary",
+        "table_name",
+        "topic",
+        "user",
+    )
+
+    log = logging.getLogger(__name__)
+
     def __init__(self, **kwargs: object):
         """Initialize the Ayon Airtable Hub."""
-        self.log = logging.getLogger(__name__)
         self.log.info("Initializing Ayon Airtable Hub.")
         self.table_name = kwargs.get("table_name", "Shots")
         self.topic = kwargs.get("topic")
@@ -32,7 +203,10 @@ class AyonAirtableHub:
         self.summary = kwargs.get("summary")
         self.payload = kwargs.get("payload")
         self.attrib_map = kwargs.get("attribs_map")
-        self._cached_hub = self.get_entity_hub(self.project_name)
+        # Events of a batch on the same project may share one EntityHub
+        self._cached_hub = kwargs.get("entity_hub")
+        if self._cached_hub is None:
+            self._cached_hub = self.get_entity_hub(self.project_name)
 
     @staticmethod
     def get_entity_hub(project_name: str) -> EntityHub:
@@ -79,11 +253,7 @@ class AyonAirtableHub:
         airtable_version = f"{version_entity.get_version():03}"
         data_to_be_synced["version"] = airtable_version
         if version_entity.task_id:
-            task = ayon_api.get_task_by_id(
-                self.project_name,
-                version_entity.task_id,
-                fields=["type"]
-            )
+            task = get_task(self.project_name, version_entity.task_id)
             task_name = [task["type"]] if task else []
             data_to_be_synced["tags"] = task_name
 
@@ -110,6 +280,7 @@ class AyonAirtableHub:
         data = self.parse_data_to_be_synced()
         self.log.info("Syncing data: %s", data)
         table = self.get_or_create_table()
+        data = self.coerce_fields(table, data)
         self.create_or_update_airtable_record(table, data, self.topic)
         self.log.info("Sync from AYON to Airtable completed.")
 
@@ -129,15 +300,336 @@ class AyonAirtableHub:
             self.log.error("No table found in Airtable base.")
             return
         record_id = self.get_record_id(table, data, topic)
+        cache_key = self.record_cache_key(table, data, topic)
         # data = self.convert_assignee_data(data)
         if record_id is None:
             self.log.info("No existing record found, creating a new one.")
-            table.create(data)
+            record = table.create(data)
+            if cache_key is not None:
+                self._cache_record_id(cache_key, record["id"], data)
         else:
             self.log.info("Updating record %s in table %s.",
                           record_id, table.name)
             # Assuming data contains the fields to update
-            table.update(record_id, data, replace=True)
+            try:
+                table.update(record_id, data, replace=True)
+            except Exception:
+                # The cached record may have been deleted, look it up
+                # again on the next attempt
+                with _RECORD_IDS_LOCK:
+                    _RECORD_IDS.pop(cache_key, None)
+                raise
+            if cache_key is not None:
+                self._cache_record_id(cache_key, record_id, data)
+
+    @classmethod
+    def flush(
+            cls,
+            hubs: List["AyonAirtableHub"]) -> List[Optional[Exception]]:
+        """Sync the data of several hubs with batched upserts.
+
+        Records matched on the same fields are sent in requests of up to
+        `UPSERT_BATCH_SIZE` records and Airtable matches them with the
+        existing records. Hubs that cannot be matched, or whose batch
+        fails, fall back to `create_or_update_airtable_record`.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of the events to sync.
+
+        Returns:
+            List[Optional[Exception]]: Error of each hub, None on success.
+        """
+        if not hubs:
+            return []
+        parsed = cls._parse_all_hubs(hubs)
+
+        errors: List[Optional[Exception]] = [None] * len(hubs)
+        # Consecutive events matched on the same (base, table, merge
+        # fields) are batched, a change of key writes the batch first so
+        # events are still applied in their order. Data by matched values
+        # with the indexes of the hubs it comes from.
+        group_key: Optional[Tuple] = None
+        group_table: Optional[pyairtable.Table] = None
+        records: Dict[Tuple, Tuple[List[int], Dict]] = {}
+        for idx, hub in enumerate(hubs):
+            data, parse_error = parsed[id(hub)]
+            if parse_error is not None:
+                hub.log.error(
+                    "Unable to read event data from AYON.",
+                    exc_info=parse_error,
+                )
+                errors[idx] = parse_error
+                continue
+            try:
+                table = hub.get_or_create_table()
+                data = hub.coerce_fields(table, data)
+                field_values = hub.match_field_values(data, hub.topic)
+                if field_values is None:
+                    cls._upsert_group(
+                        hubs, group_table, group_key, records, errors)
+                    hub.create_or_update_airtable_record(
+                        table, data, hub.topic)
+                    continue
+            except Exception as exc:
+                hub.log.exception("Unable to sync event data to Airtable.")
+                errors[idx] = exc
+                continue
+
+            key = (table.base.id, table.name, tuple(field_values))
+            if key != group_key:
+                cls._upsert_group(
+                    hubs, group_table, group_key, records, errors)
+                group_key = key
+                group_table = table
+            record_key = tuple(field_values.values())
+            indexes, previous_data = records.get(record_key, ([], {}))
+            indexes.append(idx)
+            # Later events of the record win, fields only earlier events
+            # carry are kept
+            records[record_key] = (indexes, {**previous_data, **data})
+
+        cls._upsert_group(hubs, group_table, group_key, records, errors)
+        return errors
+
+    @classmethod
+    def _parse_all_hubs(
+            cls,
+            hubs: List["AyonAirtableHub"]
+    ) -> Dict[int, Tuple[Optional[Dict], Optional[Exception]]]:
+        """Read the data to be synced of several hubs.
+
+        Reading the AYON data is independent per project, projects are
+        read in parallel. Events of a project may share an EntityHub,
+        which is not thread safe, so they are read by the same worker.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of the events to sync.
+
+        Returns:
+            Dict[int, Tuple[Optional[Dict], Optional[Exception]]]: Data
+                or error by hub object id.
+        """
+        hubs_by_project: Dict[str, List[AyonAirtableHub]] = {}
+        for hub in hubs:
+            hubs_by_project.setdefault(hub.project_name, []).append(hub)
+        workers = min(len(hubs_by_project), PARSE_MAX_WORKERS)
+        parsed: Dict[int, Tuple[Optional[Dict], Optional[Exception]]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(
+                cls._parse_hubs, hubs_by_project.values()
+            ):
+                parsed.update(result)
+        return parsed
+
+    @classmethod
+    def _upsert_group(
+            cls,
+            hubs: List["AyonAirtableHub"],
+            table: Optional[pyairtable.Table],
+            group_key: Optional[Tuple],
+            records: Dict[Tuple, Tuple[List[int], Dict]],
+            errors: List[Optional[Exception]]) -> None:
+        """Write the pending records of a group and empty it.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of the events to sync.
+            table (Optional[pyairtable.Table]): The Airtable table of the
+                group.
+            group_key (Optional[Tuple]): Base ID, table name and merge
+                fields of the group.
+            records (Dict[Tuple, Tuple[List[int], Dict]]): Hub indexes
+                and data by matched values, emptied once written.
+            errors (List[Optional[Exception]]): Error of each hub, filled
+                for the records that failed.
+        """
+        if not records:
+            return
+        cls._upsert_records(
+            hubs, table, list(group_key[2]), list(records.values()), errors)
+        records.clear()
+
+    @staticmethod
+    def _parse_hubs(
+            hubs: List["AyonAirtableHub"]
+    ) -> Dict[int, Tuple[Optional[Dict], Optional[Exception]]]:
+        """Read the data to be synced of several hubs one after another.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of one project.
+
+        Returns:
+            Dict[int, Tuple[Optional[Dict], Optional[Exception]]]: Data
+                or error by hub object id.
+        """
+        if len(hubs) > 1:
+            # Two bulk queries instead of one task query per version
+            try:
+                prefetch_tasks(
+                    hubs[0].project_name,
+                    [hub.summary["entityId"] for hub in hubs],
+                )
+            except Exception:  # noqa: BLE001
+                hubs[0].log.warning(
+                    "Unable to prefetch tasks of project %s.",
+                    hubs[0].project_name,
+                    exc_info=True,
+                )
+
+        result = {}
+        for hub in hubs:
+            try:
+                result[id(hub)] = (hub.parse_data_to_be_synced(), None)
+            except Exception as exc:  # noqa: BLE001
+                result[id(hub)] = (None, exc)
+        return result
+
+    @classmethod
+    def _upsert_records(
+            cls,
+            hubs: List["AyonAirtableHub"],
+            table: pyairtable.Table,
+            key_fields: List[str],
+            records: List[Tuple[List[int], Dict]],
+            errors: List[Optional[Exception]]) -> None:
+        """Upsert records in batches, one by one when a batch fails.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of the events to sync.
+            table (pyairtable.Table): The Airtable table of the records.
+            key_fields (List[str]): Fields Airtable matches records on.
+            records (List[Tuple[List[int], Dict]]): Hub indexes and data
+                of each record.
+            errors (List[Optional[Exception]]): Error of each hub, filled
+                for the records that failed.
+        """
+        for start in range(0, len(records), UPSERT_BATCH_SIZE):
+            chunk = records[start:start + UPSERT_BATCH_SIZE]
+            try:
+                result = table.batch_upsert(
+                    [{"fields": data} for _, data in chunk],
+                    key_fields=key_fields,
+                    replace=True,
+                )
+            except Exception:  # noqa: BLE001
+                hubs[chunk[0][0][-1]].log.warning(
+                    "Batch upsert to table %s failed, syncing records "
+                    "one by one.",
+                    table.name,
+                    exc_info=True,
+                )
+                cls._sync_records_one_by_one(hubs, table, chunk, errors)
+                continue
+
+            # Airtable returns the records in the order they were sent
+            for offset, (indexes, data) in enumerate(chunk):
+                hub = hubs[indexes[-1]]
+                cache_key = hub.record_cache_key(table, data, hub.topic)
+                cls._cache_record_id(
+                    cache_key, result["records"][offset]["id"], data)
+
+    @staticmethod
+    def _sync_records_one_by_one(
+            hubs: List["AyonAirtableHub"],
+            table: pyairtable.Table,
+            records: List[Tuple[List[int], Dict]],
+            errors: List[Optional[Exception]]) -> None:
+        """Create or update records with one request each.
+
+        The records are distinct, their requests are sent in parallel.
+
+        Args:
+            hubs (List[AyonAirtableHub]): Hubs of the events to sync.
+            table (pyairtable.Table): The Airtable table of the records.
+            records (List[Tuple[List[int], Dict]]): Hub indexes and data
+                of each record.
+            errors (List[Optional[Exception]]): Error of each hub, filled
+                for the records that failed.
+        """
+        def sync_record(indexes: List[int], data: Dict) -> None:
+            hub = hubs[indexes[-1]]
+            try:
+                hub.create_or_update_airtable_record(table, data, hub.topic)
+            except Exception as exc:
+                hub.log.exception("Unable to sync event data to Airtable.")
+                for idx in indexes:
+                    errors[idx] = exc
+
+        workers = min(len(records), WRITE_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for indexes, data in records:
+                executor.submit(sync_record, indexes, data)
+
+    def match_field_values(
+            self, data: Dict, topic: str) -> Optional[Dict[str, str]]:
+        """Get the Airtable field values identifying the record of data.
+
+        Args:
+            data (Dict): The data to match against existing records.
+            topic (str): The topic of the event.
+
+        Returns:
+            Optional[Dict[str, str]]: Values by Airtable field name, None
+                when the record cannot be matched.
+        """
+        match_keys = MATCH_KEYS_BY_TOPIC.get(topic)
+        if match_keys is None:
+            return None
+
+        match_fields = [self.attrib_map.get(key) for key in match_keys]
+        field_values = {field: data.get(field) for field in match_fields}
+        if not all(match_fields) or None in field_values.values():
+            return None
+        return field_values
+
+    def record_cache_key(
+            self, table: pyairtable.Table,
+            data: Dict, topic: str) -> Optional[Tuple]:
+        """Get the key of the record ID cache for the given data.
+
+        Args:
+            table (pyairtable.Table): The Airtable table of the record.
+            data (Dict): The data to match against existing records.
+            topic (str): The topic of the event.
+
+        Returns:
+            Optional[Tuple]: The cache key, None when it cannot be matched.
+        """
+        field_values = self.match_field_values(data, topic)
+        if field_values is None:
+            return None
+        return (table.base.id, table.name, tuple(field_values.items()))
+
+    @staticmethod
+    def _cache_record_id(
+            cache_key: Tuple, record_id: str,
+            data: Optional[Dict] = None) -> None:
+        """Remember a record ID, dropping the oldest entry when full.
+
+        When the record was just written, other keys pointing to it whose
+        values differ from the written data, e.g. the version ID of a
+        previous version, no longer match the record and are dropped.
+
+        Args:
+            cache_key (Tuple): Key from `record_cache_key`.
+            record_id (str): ID of the Airtable record.
+            data (Optional[Dict]): Fields written to the record, None when
+                it was only looked up.
+        """
+        with _RECORD_IDS_LOCK:
+            if data is not None:
+                stale_keys = [
+                    key for key, (_, cached_id) in _RECORD_IDS.items()
+                    if cached_id == record_id and any(
+                        field in data and data[field] != value
+                        for field, value in key[2]
+                    )
+                ]
+                for key in stale_keys:
+                    del _RECORD_IDS[key]
+            if len(_RECORD_IDS) >= RECORD_ID_CACHE_SIZE:
+                _RECORD_IDS.pop(next(iter(_RECORD_IDS)))
+            _RECORD_IDS[cache_key] = (
+                time.monotonic() + RECORD_ID_CACHE_TTL, record_id)
 
     def get_record_id(
             self, table: pyairtable.Table, data: Dict, topic: str) -> str:
@@ -151,27 +643,21 @@ class AyonAirtableHub:
         Returns:
             record_id: str
         """
-        for record in table.all():
-            if not record.get("fields", {}):
-                continue
-            fields = record.get("fields", {})
-            project = self.attrib_map.get("project")
-            product_name = self.attrib_map.get("product_name")
-            if topic == "entity.version.created" and (
-                data.get(project) in fields.get(project) and
-                data.get(product_name) in fields.get(product_name)
-            ):
-                return record["id"]
-
-            version_id = self.attrib_map.get("version_id")
-            if topic == "entity.version.status_changed" and (
-                data.get(project) in fields.get(project) and
-                data.get(product_name) in fields.get(product_name) and
-                data.get(version_id) in fields.get(version_id)
-            ):
-
-                return record["id"]
-        return None
+        field_values = self.match_field_values(data, topic)
+        if field_values is None:
+            return None
+        cache_key = self.record_cache_key(table, data, topic)
+        cached = _RECORD_IDS.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        # Airtable filters the records, only the first match is returned
+        record = table.first(
+            formula=match(field_values), fields=list(field_values))
+        if record is None:
+            return None
+        self._cache_record_id(cache_key, record["id"])
+        return record["id"]
 
     def get_or_create_table(self) -> pyairtable.Table:
         """Get the Airtable table for the current base.
@@ -185,18 +671,63 @@ class AyonAirtableHub:
             pyairtable.Table: The Airtable table object for the current base,
             or None if not found.
         """
-        try:
-            table = self.base.table(self.table_name)
-            table.all()
-
-        except Exception:
-            self.log.exception(
-                "Error retrieving table %s", self.table_name
-            )
-            raise
+        # Resolving a table by name needs no request, errors surface on
+        # the first record query
+        key = (self.base.id, self.table_name)
+        table = _TABLES.get(key)
+        if table is None:
+            try:
+                table = self.base.table(self.table_name)
+            except Exception:
+                self.log.exception(
+                    "Error retrieving table %s", self.table_name
+                )
+                raise
+            _TABLES[key] = table
 
         return table
 
+    def coerce_fields(self, table: pyairtable.Table, data: Dict) -> Dict:
+        """Convert values to the types of their Airtable fields.
+
+        The table schema is read once per table, a failed read is retried
+        on the next call. Values already match their fields, so records
+        are not rejected with a type error.
+
+        Args:
+            table (pyairtable.Table): The Airtable table of the record.
+            data (Dict): Values by Airtable field name.
+
+        Returns:
+            Dict: The data with converted values.
+        """
+        key = (table.base.id, table.name)
+        field_types = _FIELD_TYPES.get(key)
+        if field_types is None:
+            try:
+                field_types = {
+                    field.name: field.type for field in table.schema().fields
+                }
+            except requests.RequestException:
+                # e.g. the token lacks the schema read scope, send the
+                # values unchanged and retry with the next record
+                self.log.warning(
+                    "Unable to read schema of table %s.",
+                    table.name,
+                    exc_info=True,
+                )
+                return data
+            _FIELD_TYPES[key] = field_types
+
+        result = {}
+        for field, value in data.items():
+            coercer = FIELD_COERCERS.get(field_types.get(field))
+            if coercer is None or value is None:
+                result[field] = value
+            else:
+                result[field] = coercer(value)
+        return result
+
     # def convert_assignee_data(self, data: Dict) -> Dict:
     #     """Convert assignee data to a format suitable for Airtable.
 
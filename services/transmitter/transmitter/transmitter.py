@@ -8,16 +8,40 @@ enabled projects.
 """
 
 import logging
+import random
 import sys
 import time
 import traceback
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple
 
 import ayon_api
 import pyairtable
+from requests.adapters import HTTPAdapter
 
 from .handlers.sync_from_ayon import AyonAirtableHub
 
+if TYPE_CHECKING:
+    from ayon_api.entity_hub import EntityHub
+
+EVENTS_WE_CARE = [
+    "entity.version.created",
+    "entity.version.status_changed",
+]
+# Maximum number of events enrolled and synced together.
+EVENT_BATCH_SIZE = 50
+# Seconds for which the names of sync enabled projects are reused.
+SYNC_PROJECTS_TTL = 60
+# Seconds for which the EntityHub of a project is reused across batches.
+ENTITY_HUB_TTL = 60
+# Shortest idle wait in seconds, doubled on every empty enroll up to the
+# poll interval.
+IDLE_BACKOFF_MIN = 0.05
+# Upper bound in seconds of the random jitter added to idle waits.
+IDLE_BACKOFF_JITTER = 0.1
+# Airtable responses which are retried with backoff, 429 is the rate limit.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
 
 class AirtableTransmitter:
     """Handles synchronization of AYON entity events to Airtable.
@@ -45,7 +69,11 @@ class AirtableTransmitter:
         """
         self.log.info("Initializing the Airtable Transmitter.")
 
-        self._cached_hubs = {}
+        # EntityHub by project name with the time it was created
+        self._cached_hubs: Dict[str, Tuple[float, EntityHub]] = {}
+        self._apis: Dict[str, pyairtable.Api] = {}
+        self._sync_project_names: Optional[FrozenSet[str]] = None
+        self._sync_projects_fetched_at = 0.0
         try:
             self.settings = ayon_api.get_service_addon_settings()
             service_settings = self.settings["service_settings"]
@@ -93,12 +121,31 @@ class AirtableTransmitter:
             self, airtable_api_key: Optional[str] = None) -> pyairtable.Api:
         """Get Api access token to access Airtable.
 
+        The Api, and with it its connection pool, is created once per key.
+        Rate limited and transient server errors are retried with backoff.
+
         Returns:
             pyairtable.Api: Api access
         """
         if airtable_api_key is None:
             airtable_api_key = self.airtable_api_key
-        return pyairtable.Api(self.airtable_api_key)
+        api = self._apis.get(airtable_api_key)
+        if api is None:
+            retry = pyairtable.retry_strategy(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=RETRY_STATUS_CODES,
+            )
+            # The adapter below carries the retries, pyairtable must not
+            # mount its own
+            api = pyairtable.Api(airtable_api_key, retry_strategy=False)
+            # Keep-alive pool sized for the parallel workers of a batch
+            adapter = HTTPAdapter(
+                pool_connections=4, pool_maxsize=16, max_retries=retry
+            )
+            api.session.mount("https://", adapter)
+            self._apis[airtable_api_key] = api
+        return api
 
     def get_bases_data_by_api_key(self) -> Dict:
         """Get Airtable bases data by API key.
@@ -129,41 +176,89 @@ class AirtableTransmitter:
                     return api.base(base["id"])
         return None
 
+    @staticmethod
+    def _enroll_events() -> List[Dict]:
+        """Enroll up to `EVENT_BATCH_SIZE` pending AYON entity events.
+
+        Returns:
+            List[Dict]: Enrolled event jobs, empty when the queue is idle.
+        """
+        events = []
+        while len(events) < EVENT_BATCH_SIZE:
+            # enrolling only events which were not created by any
+            # of service users so loopback is avoided
+            event = ayon_api.enroll_event_job(
+                EVENTS_WE_CARE,
+                "airtable.push",
+                ayon_api.get_service_name(),
+                ignore_sender_types=["airtable"],
+                description=(
+                    "Handle AYON entity changes and "
+                    "sync them to Airtable."
+                ),
+                max_retries=2
+            )
+            if not event:
+                break
+            events.append(event)
+        return events
+
     def start_processing(self) -> None:
         """Main loop querying AYON for `entity.*` events.
 
         We enroll to events that `created` and `status_changed`
         on AYON `entity` to replicate the event in Airtable.
-        """
-        events_we_care = [
-            "entity.version.created",
-            "entity.version.status_changed",
-        ]
 
+        Pending events are enrolled in batches and synced to Airtable
+        together, see `AyonAirtableHub.flush`.
+        """
+        idle_backoff = 0.0
         while True:
             try:
-                # enrolling only events which were not created by any
-                # of service users so loopback is avoided
-                event = ayon_api.enroll_event_job(
-                    events_we_care,
-                    "airtable.push",
-                    ayon_api.get_service_name(),
-                    ignore_sender_types=["airtable"],
-                    description=(
-                        "Handle AYON entity changes and "
-                        "sync them to Airtable."
-                    ),
-                    max_retries=2
+                events = self._enroll_events()
+            except Exception:
+                self.log.exception("Error enrolling events")
+                events = []
+
+            if not events:
+                # Back off while idle, a busy queue is drained
+                # back-to-back without waiting.
+                idle_backoff = min(
+                    max(idle_backoff * 2, IDLE_BACKOFF_MIN),
+                    self.poll_interval,
                 )
+                time.sleep(
+                    idle_backoff
+                    + random.random() * IDLE_BACKOFF_JITTER  # noqa: S311
+                )
+                continue
 
-                if not event:
-                    time.sleep(self.poll_interval)
-                    continue
+            idle_backoff = 0.0
 
-                source_event = ayon_api.get_event(event["dependsOn"])
+            self.process_events(events)
 
-                project_name = source_event["project"]
+    def process_events(self, events: List[Dict]) -> None:
+        """Sync a batch of enrolled events to Airtable.
 
+        Args:
+            events (List[Dict]): Enrolled event jobs.
+        """
+        hubs = []
+        hub_events = []
+        # Versions are read through one EntityHub per project, reused
+        # across batches, see `_get_entity_hub`.
+        # Source events are fetched in parallel, they are handled in order
+        get_event = ayon_api.get_event
+        with ThreadPoolExecutor(max_workers=EVENT_BATCH_SIZE) as executor:
+            pending = [
+                (event, executor.submit(get_event, event["dependsOn"]))
+                for event in events
+            ]
+        for event, source_future in pending:
+            project_name = None
+            try:
+                source_event = source_future.result()
+                project_name = source_event["project"]
                 if project_name not in self._get_sync_project_names():
                     self.log.info(
                         "Project %s does not exist in AYON or does not have"
@@ -189,42 +284,111 @@ class AirtableTransmitter:
                     "payload": source_event["payload"],
                     "attribs_map": self.attribs_map
                 }
-                hub = AyonAirtableHub(**kwargs)
-                hub.sync_from_ayon_to_airtable()
-
-                self.log.info(
-                    "Event has been processed... setting to finished!"
+                kwargs["entity_hub"] = self._get_entity_hub(
+                    project_name, source_event["summary"]["entityId"])
+                hubs.append(AyonAirtableHub(**kwargs))
+                hub_events.append((event, project_name))
+            except Exception:
+                self.log.exception("Error processing event")
+                self._fail_event(event, project_name, traceback.format_exc())
+
+        errors = AyonAirtableHub.flush(hubs) if hubs else []
+        for idx, (event, project_name) in enumerate(hub_events):
+            error = errors[idx]
+            if error is not None:
+                self._fail_event(
+                    event,
+                    project_name,
+                    "".join(traceback.format_exception(
+                        type(error), error, error.__traceback__)),
                 )
+                continue
+
+            self.log.info(
+                "Event has been processed... setting to finished!"
+            )
+            try:
                 ayon_api.update_event(
                     event["id"],
                     project_name=project_name,
                     status="finished"
                 )
             except Exception:
-                self.log.exception("Error processing event")
+                self.log.exception("Error finishing event %s", event["id"])
 
-                ayon_api.update_event(
-                    event["id"],
-                    project_name=project_name,
-                    status="failed",
-                    payload={
-                        "message": traceback.format_exc(),
-                    },
-                )
+    def _fail_event(
+            self, event: Dict, project_name: Optional[str],
+            message: str) -> None:
+        """Mark an event as failed.
 
-    @staticmethod
-    def _get_sync_project_names() -> list:
+        Args:
+            event (Dict): The enrolled event job.
+            project_name (Optional[str]): Name of the event project.
+            message (str): Error message stored in the event payload.
+        """
+        try:
+            ayon_api.update_event(
+                event["id"],
+                project_name=project_name,
+                status="failed",
+                payload={
+                    "message": message,
+                },
+            )
+        except Exception:
+            self.log.exception("Error failing event %s", event["id"])
+
+    def _get_entity_hub(
+            self, project_name: str, entity_id: str) -> "EntityHub":
+        """Get the EntityHub of a project, reused for `ENTITY_HUB_TTL`.
+
+        A hub which already holds the entity of the event was loaded
+        before the entity changed, it is replaced so the change is read.
+
+        Args:
+            project_name (str): Name of the project.
+            entity_id (str): ID of the entity of the event.
+
+        Returns:
+            EntityHub: The EntityHub of the project.
+        """
+        now = time.monotonic()
+        cached = self._cached_hubs.get(project_name)
+        if (
+            cached is not None
+            and now - cached[0] < ENTITY_HUB_TTL
+            and cached[1].get_entity_by_id(entity_id) is None
+        ):
+            return cached[1]
+
+        entity_hub = AyonAirtableHub.get_entity_hub(project_name)
+        self._cached_hubs[project_name] = (now, entity_hub)
+        return entity_hub
+
+    def _get_sync_project_names(self) -> FrozenSet[str]:
         """Get project names that are enabled for Airtable sync.
 
+        The names are cached for `SYNC_PROJECTS_TTL` seconds.
+
         Returns:
-            list: List of project names enabled for Airtable sync.
+            FrozenSet[str]: Names of projects enabled for Airtable sync.
         """
-        ayon_projects = ayon_api.get_projects(fields=["name", "attrib"])
-        return [
+        now = time.monotonic()
+        if (
+            self._sync_project_names is not None
+            and now - self._sync_projects_fetched_at < SYNC_PROJECTS_TTL
+        ):
+            return self._sync_project_names
+
+        ayon_projects = ayon_api.get_projects(
+            fields=["name", "attrib.airtablePush"])
+        self._sync_project_names = frozenset(
             project["name"]
             for project in ayon_projects
             if project["attrib"].get("airtablePush")
-        ]
+        )
+        self._sync_projects_fetched_at = now
+        return self._sync_project_names
 
 
 def service_main() -> None: